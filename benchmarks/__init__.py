@@ -0,0 +1 @@
+"""Benchmarks for pyp6. Run with `python -m benchmarks.run`; see benchmarks/run.py."""
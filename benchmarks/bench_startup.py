@@ -0,0 +1,109 @@
+# --- START OF FILE benchmarks/bench_startup.py ---
+"""
+Startup benchmark for the pyp6 console scripts.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+every entry point, reports the cumulative import time of the module and the
+wall-clock time of the whole process, and fails (exit code 1) if any entry
+point is over budget or pulls in a heavy dependency at import time.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 100] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Module behind each `pyp6-*` entry point in pyproject.toml.
+ENTRY_POINTS = {
+    "pyp6-init": "pyp6.scripts.init",
+    "pyp6-activities": "pyp6.scripts.activities",
+    "pyp6-obs": "pyp6.scripts.obs",
+    "pyp6-wbs": "pyp6.scripts.wbs",
+    "pyp6-roles": "pyp6.scripts.roles",
+    "pyp6-progress": "pyp6.scripts.progress",
+    "pyp6": "pyp6.scripts.cli",
+}
+
+# Modules that must only ever be imported on the code paths that need them.
+HEAVY_MODULES = ("pandas", "numpy")
+
+
+def measure_entry_point(module):
+    """
+    Imports `module` in a fresh interpreter and returns
+    (process wall time in ms, cumulative import time of `module` in ms, set of imported module names).
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr}")
+
+    import_ms = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indent><name>"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        imported.add(name)
+        if name == module:
+            import_ms = int(cumulative) / 1000
+    return wall_ms, import_ms, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure startup time of the pyp6 console scripts.")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="Maximum allowed median process time per entry point (default: 100).")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Number of fresh interpreters to start per entry point (default: 5).")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'Entry point':<18} {'process ms':>11} {'import ms':>10}  heavy imports")
+    for script, module in ENTRY_POINTS.items():
+        walls, imports, heavy = [], [], set()
+        for _ in range(args.runs):
+            wall_ms, import_ms, imported = measure_entry_point(module)
+            walls.append(wall_ms)
+            imports.append(import_ms or 0.0)
+            heavy |= {name for name in imported if name.split(".")[0] in HEAVY_MODULES}
+
+        wall_ms = statistics.median(walls)
+        import_ms = statistics.median(imports)
+        heavy_roots = sorted({name.split(".")[0] for name in heavy})
+        print(f"{script:<18} {wall_ms:>11.1f} {import_ms:>10.1f}  {', '.join(heavy_roots) or '-'}")
+
+        if wall_ms > args.budget_ms:
+            failures.append(f"{script}: {wall_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        if heavy_roots:
+            failures.append(f"{script}: imports {', '.join(heavy_roots)} at startup")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  -> {failure}")
+        sys.exit(1)
+    print("\nSUCCESS: All entry points start within budget.")
+
+
+if __name__ == "__main__":
+    main()
+
+# --- END OF FILE benchmarks/bench_startup.py ---
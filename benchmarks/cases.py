@@ -0,0 +1,350 @@
+# --- START OF FILE benchmarks/cases.py ---
+"""
+Benchmark cases.
+
+A case is a function decorated with @case(name) that receives a BenchContext,
+does any setup it needs, and returns the number of seconds spent in the part
+being measured (use the `timed()` helper). Cases marked `sized=False` do not
+depend on the workload size and run once per benchmark session.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from benchmarks.bench_startup import ENTRY_POINTS, SRC_DIR, measure_entry_point
+from benchmarks.synthetic import DATA_DATE, HOURS_PER_DAY, PROJECT_SHORT_NAME
+
+CASES = {}
+
+# Rows per call for the "resident service" benchmarks.
+SERVICE_BATCH_SIZE = 100
+
+# Data date of the progress update benchmarks: one week after the generated data date.
+PROGRESS_DATA_DATE = DATA_DATE + timedelta(days=7)
+
+
+def case(name, sized=True):
+    """Registers a benchmark case under `name`."""
+    def register(fn):
+        CASES[name] = (fn, sized)
+        return fn
+    return register
+
+
+class Timer:
+    elapsed = 0.0
+
+
+@contextmanager
+def timed():
+    """Measures the wall time of the `with` block: `with timed() as t: ...; return t.elapsed`."""
+    timer = Timer()
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.elapsed = time.perf_counter() - start
+
+
+def read_workload(ctx, file_name):
+    from pyp6.utils import read_csv_rows
+    return read_csv_rows(ctx.workload_dir / file_name, [])
+
+
+def open_project(db_path):
+    from pyp6.project import P6Project
+    return P6Project(db_path, PROJECT_SHORT_NAME, hours_per_day=HOURS_PER_DAY)
+
+
+def fresh_copy(ctx, source, name):
+    """Copies a generated database into the scratch folder so a case can write to it."""
+    target = ctx.scratch_dir / name
+    shutil.copyfile(source, target)
+    return target
+
+
+def exported_xml(ctx):
+    """The populated database exported to MSPDI once per size, for the import cases."""
+    import sqlite3
+    from pyp6.mspdi import export_mspdi
+
+    xml_path = ctx.scratch_dir / "import.xml"
+    if not xml_path.exists():
+        conn = sqlite3.connect(ctx.populated_db)
+        export_mspdi(conn.cursor(), PROJECT_SHORT_NAME, xml_path, HOURS_PER_DAY)
+        conn.close()
+    return xml_path
+
+
+def progress_rows(db_path, data_date):
+    """
+    A weekly update as of `data_date`: every activity that is in progress or
+    due to start by then gets actuals, half of them finishing and half
+    reporting percent complete and remaining duration.
+    """
+    import sqlite3
+    from pyp6.progress import PROGRESS_COLUMNS
+
+    conn = sqlite3.connect(db_path)
+    tasks = conn.execute(
+        "SELECT task_code, act_start_date FROM TASK WHERE status_code != 'TK_Complete' AND target_start_date <= ?"
+        " ORDER BY task_id", (f"{data_date:%Y-%m-%d %H:%M:%S}",),
+    ).fetchall()
+    conn.close()
+    actual_start = f"{DATA_DATE:%Y-%m-%d %H:%M}"
+    rows = []
+    for i, (code, act_start) in enumerate(tasks):
+        row = dict.fromkeys(PROGRESS_COLUMNS, "")
+        row["Activity_ID"] = code
+        row["Actual_Start"] = "" if act_start else actual_start
+        if i % 2:
+            row["Actual_Finish"] = f"{data_date:%Y-%m-%d}"
+        else:
+            row["Physical_Pct_Complete"] = "50"
+            row["Remaining_Duration_Days"] = "3"
+        rows.append(row)
+    return rows
+
+
+def write_progress_csv(path, rows):
+    import csv
+    from pyp6.progress import PROGRESS_COLUMNS
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=PROGRESS_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_cli(ctx, db_path, args):
+    """Runs a pyp6 console script in a fresh interpreter against `db_path` and the size's workload."""
+    home = ctx.scratch_dir / "home"
+    (home / ".pyp6").mkdir(parents=True, exist_ok=True)
+    with open(home / ".pyp6" / "config.json", "w") as f:
+        json.dump({
+            "database_path": str(db_path),
+            "data_folder_path": str(ctx.workload_dir),
+            "TARGET_PROJECT_ID": PROJECT_SHORT_NAME,
+            "HOURS_PER_DAY": HOURS_PER_DAY,
+        }, f)
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home), PYTHONPATH=str(SRC_DIR))
+    with timed() as t:
+        result = subprocess.run([sys.executable, "-m"] + args, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{' '.join(args)}' failed:\n{result.stderr}")
+    return t.elapsed
+
+
+# --- Imports ---
+
+def _import_case(script, module):
+    @case(f"import.{script}", sized=False)
+    def run(ctx):
+        _, import_ms, _ = measure_entry_point(module)
+        return (import_ms or 0.0) / 1000
+    return run
+
+
+for _script, _module in ENTRY_POINTS.items():
+    _import_case(_script, _module)
+
+
+# --- Entry points ---
+
+@case("cli.pyp6-init", sized=False)
+def cli_init(ctx):
+    home = ctx.scratch_dir / "init-home"
+    shutil.rmtree(home, ignore_errors=True)
+    home.mkdir(parents=True)
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home), PYTHONPATH=str(SRC_DIR))
+    with timed() as t:
+        subprocess.run([sys.executable, "-m", "pyp6.scripts.init"], env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+    return t.elapsed
+
+
+@case("cli.pyp6-obs")
+def cli_obs(ctx):
+    return run_cli(ctx, fresh_copy(ctx, ctx.base_db, "cli.db"), ["pyp6.scripts.obs"])
+
+
+@case("cli.pyp6-wbs")
+def cli_wbs(ctx):
+    return run_cli(ctx, fresh_copy(ctx, ctx.base_db, "cli.db"), ["pyp6.scripts.wbs"])
+
+
+@case("cli.pyp6-roles")
+def cli_roles(ctx):
+    return run_cli(ctx, fresh_copy(ctx, ctx.base_db, "cli.db"), ["pyp6.scripts.roles"])
+
+
+@case("cli.pyp6-activities")
+def cli_activities(ctx):
+    db_path = fresh_copy(ctx, ctx.base_db, "cli.db")
+    with open_project(db_path) as project:
+        project.add_wbs(read_workload(ctx, "wbs.csv"))
+    return run_cli(ctx, db_path, ["pyp6.scripts.activities"])
+
+
+@case("cli.pyp6-load")
+def cli_load(ctx):
+    return run_cli(ctx, fresh_copy(ctx, ctx.base_db, "cli.db"), ["pyp6.scripts.cli", "load"])
+
+
+@case("cli.pyp6-progress")
+def cli_progress(ctx):
+    db_path = fresh_copy(ctx, ctx.populated_db, "cli.db")
+    csv_path = ctx.scratch_dir / "progress.csv"
+    write_progress_csv(csv_path, progress_rows(db_path, PROGRESS_DATA_DATE))
+    return run_cli(ctx, db_path, ["pyp6.scripts.progress", "--data-date", f"{PROGRESS_DATA_DATE:%Y-%m-%d %H:%M}",
+                                  "--file", str(csv_path)])
+
+
+@case("cli.pyp6-export-mspdi")
+def cli_export_mspdi(ctx):
+    return run_cli(ctx, ctx.populated_db, ["pyp6.scripts.cli", "export-mspdi", str(ctx.scratch_dir / "cli.xml")])
+
+
+@case("cli.pyp6-import-mspdi")
+def cli_import_mspdi(ctx):
+    return run_cli(ctx, fresh_copy(ctx, ctx.base_db, "cli.db"),
+                   ["pyp6.scripts.cli", "import-mspdi", str(exported_xml(ctx))])
+
+
+@case("cli.pyp6-earned-value")
+def cli_earned_value(ctx):
+    return run_cli(ctx, ctx.populated_db, ["pyp6.scripts.cli", "earned-value"])
+
+
+# --- Library operations ---
+
+@case("lib.open")
+def lib_open(ctx):
+    """Opening a P6Project on a populated database: connection plus cache warm-up."""
+    with timed() as t:
+        project = open_project(ctx.populated_db)
+    project.close()
+    return t.elapsed
+
+
+@case("lib.bulk_load")
+def lib_bulk_load(ctx):
+    """The whole workload through the library API in one transaction."""
+    stages = [(name, read_workload(ctx, f"{name}.csv")) for name in ("obs", "wbs", "roles", "activities")]
+    with open_project(fresh_copy(ctx, ctx.base_db, "lib.db")) as project:
+        with timed() as t:
+            with project.transaction():
+                for name, rows in stages:
+                    if name == "activities":
+                        project.add_activities(rows)
+                        project.add_relationships(rows)
+                    else:
+                        getattr(project, f"add_{name}")(rows)
+    return t.elapsed
+
+
+@case("lib.service_batch")
+def lib_service_batch(ctx):
+    """
+    Mean time per small batch (SERVICE_BATCH_SIZE activities plus their links)
+    pushed into a populated database through one resident P6Project.
+    """
+    wbs_rows = read_workload(ctx, "wbs.csv")
+    activities = read_workload(ctx, "activities.csv")
+    batches = [activities[i:i + SERVICE_BATCH_SIZE] for i in range(0, min(len(activities), 20 * SERVICE_BATCH_SIZE),
+                                                                  SERVICE_BATCH_SIZE)]
+    with open_project(fresh_copy(ctx, ctx.populated_db, "lib.db")) as project:
+        project.add_wbs(wbs_rows)
+        with timed() as t:
+            for batch in batches:
+                project.add_activities(batch)
+                project.add_relationships(batch)
+    return t.elapsed / len(batches)
+
+
+# --- MS Project XML ---
+
+@case("mspdi.export")
+def mspdi_export(ctx):
+    import sqlite3
+    from pyp6.mspdi import export_mspdi
+
+    conn = sqlite3.connect(ctx.populated_db)
+    try:
+        with timed() as t:
+            export_mspdi(conn.cursor(), PROJECT_SHORT_NAME, ctx.scratch_dir / "export.xml", HOURS_PER_DAY)
+    finally:
+        conn.close()
+    return t.elapsed
+
+
+def _table_counts(cursor):
+    return tuple(cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                 for table in ("PROJWBS", "TASK", "TASKPRED"))
+
+
+@case("mspdi.import")
+def mspdi_import(ctx):
+    """
+    Parses an exported project and loads it into an empty one (timed), then
+    checks the round trip: the copy has the same activities and relationships
+    as the source, and importing the file again changes nothing.
+    """
+    import sqlite3
+    from pyp6.mspdi import import_mspdi
+
+    xml_path = exported_xml(ctx)
+    with open_project(fresh_copy(ctx, ctx.base_db, "lib.db")) as project:
+        with timed() as t:
+            import_mspdi(project, xml_path)
+
+        conn = sqlite3.connect(ctx.populated_db)
+        source_counts = _table_counts(conn.cursor())
+        conn.close()
+        imported_counts = _table_counts(project.cursor)
+        if imported_counts[1:] != source_counts[1:]:
+            raise RuntimeError(f"MSPDI round trip changed TASK/TASKPRED counts: {source_counts[1:]} -> {imported_counts[1:]}")
+        import_mspdi(project, xml_path)
+        if _table_counts(project.cursor) != imported_counts:
+            raise RuntimeError("Importing the same MSPDI file twice added rows.")
+    return t.elapsed
+
+
+# --- Earned value ---
+
+@case("ev.rollup")
+def ev_rollup(ctx):
+    import sqlite3
+    from pyp6.earned_value import compute_earned_value
+
+    conn = sqlite3.connect(ctx.populated_db)
+    try:
+        with timed() as t:
+            compute_earned_value(conn.cursor(), PROJECT_SHORT_NAME)
+    finally:
+        conn.close()
+    return t.elapsed
+
+
+# --- Progress updates ---
+
+@case("progress.update")
+def progress_update(ctx):
+    """The weekly update of progress_rows() through the library, one week after the generated data date."""
+    from pyp6.progress import apply_progress
+
+    db_path = fresh_copy(ctx, ctx.populated_db, "lib.db")
+    rows = progress_rows(db_path, PROGRESS_DATA_DATE)
+    with open_project(db_path) as project:
+        with timed() as t:
+            apply_progress(project, rows, PROGRESS_DATA_DATE)
+    return t.elapsed
+
+# --- END OF FILE benchmarks/cases.py ---
@@ -0,0 +1,187 @@
+# --- START OF FILE benchmarks/run.py ---
+"""
+Runs the pyp6 benchmark suite, records the results as JSON and flags
+regressions against a stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.run                          # 1k and 10k activities
+    python -m benchmarks.run --sizes 1k,10k,100k,1m   # full suite
+    python -m benchmarks.run --cases lib.             # only cases starting with 'lib.'
+    python -m benchmarks.run --save-baseline          # store these results as the new baseline
+    python -m benchmarks.run --no-baseline            # just measure, without a baseline to compare against
+
+Timings depend on the machine, so no baseline is shipped: record one with
+--save-baseline first. A run without a baseline fails unless --no-baseline is given.
+
+Generated databases and workloads are cached in --work-dir, keyed by size,
+seed and generator version, so repeated runs only pay for generation once.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import types
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_startup import SRC_DIR
+
+# Benchmark the working tree, not whichever pyp6 happens to be installed.
+sys.path.insert(0, str(SRC_DIR))
+
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.cases import CASES  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_WORK_DIR = Path(tempfile.gettempdir()) / "pyp6-bench"
+
+# A case regresses when it is slower than the baseline by more than the
+# threshold AND by more than the noise floor (tiny timings jitter a lot).
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR_MS = 2.0
+
+
+def prepare_size(work_dir, size, seed):
+    """Generates (or reuses) the databases and CSV workload for one size."""
+    size_dir = work_dir / f"v{synthetic.GENERATOR_VERSION}-seed{seed}-{size}"
+    populated_db = size_dir / "populated.db"
+    base_db = size_dir / "base.db"
+    workload_dir = size_dir / "workload"
+    done_marker = size_dir / ".complete"
+    if not done_marker.exists():
+        size_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Generating synthetic data for {size:,} activities in '{size_dir}'...")
+        synthetic.generate_database(populated_db, size, seed)
+        synthetic.generate_database(base_db, 0, seed)
+        synthetic.generate_workload(workload_dir, size, seed)
+        done_marker.touch()
+
+    scratch_dir = size_dir / "scratch"
+    scratch_dir.mkdir(exist_ok=True)
+    return types.SimpleNamespace(size=size, populated_db=populated_db, base_db=base_db,
+                                 workload_dir=workload_dir, scratch_dir=scratch_dir)
+
+
+def run_case(fn, ctx, repeat):
+    timings = []
+    for _ in range(repeat):
+        # The loaders report progress on stdout; keep the benchmark output readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings.append(fn(ctx) * 1000)
+    return {"median_ms": round(statistics.median(timings), 3),
+            "min_ms": round(min(timings), 3),
+            "runs_ms": [round(t, 3) for t in timings]}
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of (key, current ms, baseline ms) for cases slower than the baseline allows."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        current_ms, baseline_ms = result["median_ms"], previous["median_ms"]
+        if current_ms > baseline_ms * (1 + threshold) and current_ms - baseline_ms > NOISE_FLOOR_MS:
+            regressions.append((key, current_ms, baseline_ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pyp6 benchmark suite.")
+    parser.add_argument("--sizes", default="1k,10k",
+                        help="Comma-separated activity counts, e.g. '1k,10k,100k,1m' (default: 1k,10k).")
+    parser.add_argument("--cases", default="",
+                        help="Only run cases whose name starts with one of these comma-separated prefixes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported (default: 3).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data (default: 0).")
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR,
+                        help=f"Where generated databases are cached (default: {DEFAULT_WORK_DIR}).")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Write the results JSON here (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="Baseline results to compare against (default: benchmarks/baseline.json).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a case is flagged, as a fraction (default: 0.25).")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the baseline instead of comparing against it.")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Only measure; do not compare against a baseline.")
+    args = parser.parse_args()
+
+    sizes = [synthetic.parse_size(label) for label in args.sizes.split(",") if label.strip()]
+    prefixes = tuple(p.strip() for p in args.cases.split(",") if p.strip())
+    selected = {name: spec for name, spec in CASES.items() if not prefixes or name.startswith(prefixes)}
+    if not selected:
+        print(f"ERROR: No benchmark cases match '{args.cases}'. Available: {', '.join(CASES)}")
+        sys.exit(1)
+
+    results = {}
+    contexts = {size: prepare_size(args.work_dir, size, args.seed) for size in sizes}
+    print(f"\n{'Case':<28} {'Size':>9} {'median ms':>11} {'min ms':>10}")
+    for name, (fn, sized) in selected.items():
+        for size in (sizes if sized else sizes[:1]):
+            key = f"{name}@{size}" if sized else name
+            result = run_case(fn, contexts[size], args.repeat)
+            results[key] = result
+            size_label = f"{size:,}" if sized else "-"
+            print(f"{name:<28} {size_label:>9} {result['median_ms']:>11.1f} {result['min_ms']:>10.1f}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "generator_version": synthetic.GENERATOR_VERSION,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    output = args.output or BENCH_DIR / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to '{output}'.")
+
+    if args.save_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if args.baseline.is_file():
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Merge so a partial run only replaces the cases it measured.
+        baseline["meta"] = report["meta"]
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline updated: '{args.baseline}'.")
+        return
+
+    if args.no_baseline:
+        return
+    if not args.baseline.is_file():
+        print(f"ERROR: No baseline found at '{args.baseline}', so regressions cannot be checked. "
+              "Run with --save-baseline to create one, or pass --no-baseline to only measure.")
+        sys.exit(1)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (more than {args.threshold:.0%} slower than baseline):")
+        for key, current_ms, baseline_ms in regressions:
+            print(f"  -> {key}: {current_ms:.1f} ms vs {baseline_ms:.1f} ms ({current_ms / baseline_ms - 1:+.0%})")
+        sys.exit(1)
+    print("\nSUCCESS: No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
+
+# --- END OF FILE benchmarks/run.py ---
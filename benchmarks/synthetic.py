@@ -0,0 +1,323 @@
+# --- START OF FILE benchmarks/synthetic.py ---
+"""
+Synthetic P6 SQLite databases and CSV workloads for benchmarking.
+
+generate_database() builds a database with a subset of the P6 schema
+(PROJECT, CALENDAR, OBS, ROLES, PROJWBS, TASK, TASKPRED, TASKRSRC) holding one
+project with the requested number of activities. generate_workload() writes
+obs.csv / wbs.csv / roles.csv / activities.csv files, in the format the pyp6
+loaders expect, that can be loaded on top of any generated database.
+
+Both are deterministic for a given size and seed.
+"""
+
+import csv
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Bump when the generated data changes, so cached databases are rebuilt.
+GENERATOR_VERSION = 2
+
+PROJECT_SHORT_NAME = "BENCH"
+HOURS_PER_DAY = 8.0
+PROJECT_START = datetime(2025, 1, 6, 8, 0)
+DATA_DATE = datetime(2026, 1, 5, 8, 0)
+
+# Shape of the generated networks.
+ACTIVITIES_PER_WBS = 15      # average leaf size
+MAX_WBS_DEPTH = 6            # levels below the project root
+MEAN_PREDECESSORS = 1.4      # TASKPRED rows per TASK
+PRED_WINDOW = 200            # predecessors are picked from the previous N activities
+RESOURCE_ASSIGNMENT_RATE = 0.6
+PRED_TYPES = (("PR_FS", 0.85), ("PR_SS", 0.08), ("PR_FF", 0.05), ("PR_SF", 0.02))
+
+SCHEMA = """
+CREATE TABLE PROJECT (
+    proj_id INTEGER PRIMARY KEY, proj_short_name TEXT, clndr_id INTEGER,
+    plan_start_date TEXT, last_recalc_date TEXT, guid TEXT
+);
+CREATE TABLE CALENDAR (
+    clndr_id INTEGER PRIMARY KEY, default_flag TEXT, clndr_name TEXT, proj_id INTEGER,
+    clndr_type TEXT, day_hr_cnt REAL, week_hr_cnt REAL, month_hr_cnt REAL, year_hr_cnt REAL,
+    clndr_data TEXT
+);
+CREATE TABLE OBS (
+    obs_id INTEGER PRIMARY KEY, parent_obs_id INTEGER, seq_num INTEGER, obs_name TEXT, guid TEXT,
+    create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE TABLE ROLES (
+    role_id INTEGER PRIMARY KEY, parent_role_id INTEGER, role_name TEXT, role_short_name TEXT,
+    create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE TABLE PROJWBS (
+    wbs_id INTEGER PRIMARY KEY, proj_id INTEGER, obs_id INTEGER, seq_num INTEGER, est_wt REAL,
+    proj_node_flag TEXT, sum_data_flag TEXT, status_code TEXT, wbs_short_name TEXT, wbs_name TEXT,
+    parent_wbs_id INTEGER, ev_compute_type TEXT, ev_etc_compute_type TEXT, guid TEXT, tmpl_guid TEXT,
+    create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE TABLE TASK (
+    task_id INTEGER PRIMARY KEY, proj_id INTEGER, wbs_id INTEGER, clndr_id INTEGER,
+    phys_complete_pct REAL, complete_pct_type TEXT, task_type TEXT, duration_type TEXT,
+    status_code TEXT, task_code TEXT, task_name TEXT,
+    target_drtn_hr_cnt REAL, remain_drtn_hr_cnt REAL, act_work_qty REAL, remain_work_qty REAL, target_work_qty REAL,
+    act_start_date TEXT, act_end_date TEXT, target_start_date TEXT, target_end_date TEXT,
+    early_start_date TEXT, early_end_date TEXT, restart_date TEXT, reend_date TEXT,
+    auto_compute_act_flag TEXT, guid TEXT, create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE TABLE TASKPRED (
+    task_pred_id INTEGER PRIMARY KEY, task_id INTEGER, pred_task_id INTEGER, proj_id INTEGER,
+    pred_proj_id INTEGER, pred_type TEXT, lag_hr_cnt REAL,
+    create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE TABLE TASKRSRC (
+    taskrsrc_id INTEGER PRIMARY KEY, task_id INTEGER, proj_id INTEGER, role_id INTEGER, rsrc_id INTEGER,
+    remain_qty REAL, target_qty REAL, act_reg_qty REAL, act_ot_qty REAL,
+    target_cost REAL, act_reg_cost REAL, act_ot_cost REAL, remain_cost REAL,
+    act_start_date TEXT, act_end_date TEXT, target_start_date TEXT, target_end_date TEXT,
+    create_date TEXT, create_user TEXT, update_date TEXT, update_user TEXT
+);
+CREATE INDEX TASK_proj_id ON TASK (proj_id);
+CREATE INDEX TASKPRED_task_id ON TASKPRED (task_id);
+CREATE INDEX TASKRSRC_task_id ON TASKRSRC (task_id);
+CREATE INDEX PROJWBS_proj_id ON PROJWBS (proj_id);
+"""
+
+STANDARD_CALENDAR_DATA = (
+    "(0||CalendarData()(  (0||DaysOfWeek()(    (0||1()())    (0||2()(  (0||0(s|08:00|f|16:00)())))"
+    "    (0||3()(  (0||0(s|08:00|f|16:00)())))    (0||4()(  (0||0(s|08:00|f|16:00)())))"
+    "    (0||5()(  (0||0(s|08:00|f|16:00)())))    (0||6()(  (0||0(s|08:00|f|16:00)())))"
+    "    (0||7()())))))"
+)
+
+USER = "PyP6_Bench"
+
+
+def parse_size(label):
+    """Converts '1k', '10k', '1m' or '2500' to an activity count."""
+    label = str(label).strip().lower()
+    multiplier = 1
+    if label.endswith("k"):
+        multiplier, label = 1_000, label[:-1]
+    elif label.endswith("m"):
+        multiplier, label = 1_000_000, label[:-1]
+    return int(float(label) * multiplier)
+
+
+def _fmt(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+
+def _wbs_tree(rng, wbs_count):
+    """
+    Returns a parent index for each of `wbs_count` WBS nodes (-1 is the project root).
+    Parents are drawn from recently created nodes so the tree grows deep in
+    places and wide in others, the way real WBS structures do.
+    """
+    parents, depths = [], []
+    for i in range(wbs_count):
+        candidates = [j for j in range(max(0, i - 30), i) if depths[j] < MAX_WBS_DEPTH]
+        if not candidates or rng.random() < 0.08:
+            parents.append(-1)
+            depths.append(1)
+        else:
+            parent = rng.choice(candidates)
+            parents.append(parent)
+            depths.append(depths[parent] + 1)
+    return parents
+
+
+def _pick_pred_type(rng):
+    roll = rng.random()
+    for pred_type, weight in PRED_TYPES:
+        roll -= weight
+        if roll < 0:
+            return pred_type
+    return PRED_TYPES[0][0]
+
+
+def _predecessor_count(rng):
+    # Mean of MEAN_PREDECESSORS with some activities unlinked and a few heavily linked.
+    return min(6, int(rng.expovariate(1 / MEAN_PREDECESSORS) + 0.5))
+
+
+def generate_database(db_path, n_activities, seed=0):
+    """
+    Creates a P6-shaped SQLite database at `db_path` holding project
+    PROJECT_SHORT_NAME with `n_activities` activities, a WBS tree, relationships
+    and role assignments. Activities before DATA_DATE carry actuals and progress.
+    With n_activities=0 only the project root, calendar and root OBS are created,
+    which is the starting point for load benchmarks.
+    """
+    rng = random.Random(seed)
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.executescript(SCHEMA)
+    now = _fmt(datetime.now())
+
+    cursor.execute("INSERT INTO CALENDAR VALUES (1, 'Y', 'Standard 5 Day Workweek', NULL, 'CA_Base', 8, 40, 172, 2000, ?)",
+                   (STANDARD_CALENDAR_DATA,))
+    cursor.execute("INSERT INTO PROJECT VALUES (1, ?, 1, ?, ?, ?)",
+                   (PROJECT_SHORT_NAME, _fmt(PROJECT_START), _fmt(DATA_DATE), "BENCHPROJECTGUID"))
+
+    # --- OBS and Roles ---
+    obs_count = max(1, n_activities // 1000)
+    obs_rows = [(1, None, 10, "Enterprise", "OBS1", now, USER, now, USER)]
+    obs_rows += [(i, rng.randint(1, i - 1), i * 10, f"OBS {i}", f"OBS{i}", now, USER, now, USER)
+                 for i in range(2, obs_count + 2)]
+    cursor.executemany("INSERT INTO OBS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", obs_rows)
+
+    role_count = 40 if n_activities else 0
+    role_rows = [(i, rng.randint(1, i - 1) if i > 5 else None, f"Role {i}", f"R{i}", now, USER, now, USER)
+                 for i in range(1, role_count + 1)]
+    cursor.executemany("INSERT INTO ROLES VALUES (?, ?, ?, ?, ?, ?, ?, ?)", role_rows)
+
+    # --- WBS ---
+    root_wbs_id = 1
+    cursor.execute("INSERT INTO PROJWBS VALUES (1, 1, 1, 0, 1.0, 'Y', 'N', 'WS_Open', ?, ?, NULL, "
+                   "'EC_Cmp_pct', 'EE_Rem_hr', 'WBS1', NULL, ?, ?, ?, ?)",
+                   (PROJECT_SHORT_NAME, PROJECT_SHORT_NAME, now, USER, now, USER))
+    wbs_count = max(1, n_activities // ACTIVITIES_PER_WBS) if n_activities else 0
+    wbs_parents = _wbs_tree(rng, wbs_count)
+    wbs_rows = []
+    for i, parent in enumerate(wbs_parents):
+        wbs_id = i + 2
+        parent_wbs_id = root_wbs_id if parent < 0 else parent + 2
+        wbs_rows.append((
+            wbs_id, 1, rng.randint(1, obs_count + 1), (i + 1) * 10, float(rng.randint(1, 10)),
+            'N', 'N', 'WS_Open', f"W{wbs_id}", f"WBS {wbs_id}", parent_wbs_id,
+            rng.choice(("EC_Cmp_pct", "EC_Cmp_pct", "EC_0_100", "EC_50_50", "EC_User_pct")), "EE_Rem_hr",
+            f"WBS{wbs_id}", None, now, USER, now, USER,
+        ))
+    cursor.executemany("INSERT INTO PROJWBS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", wbs_rows)
+
+    # --- Activities, relationships and resource assignments ---
+    # Activities are laid out roughly sequentially so early ones are complete,
+    # those around the data date are in progress and the rest not started.
+    span_days = max(60, int(n_activities ** 0.5 * 12))
+    task_rows, pred_rows, rsrc_rows = [], [], []
+    pred_id = rsrc_id = 1
+    for i in range(n_activities):
+        task_id = i + 1
+        wbs_id = rng.randint(2, wbs_count + 1)
+        duration_days = rng.choice((1, 2, 3, 5, 5, 10, 10, 15, 20, 30, 60))
+        start = PROJECT_START + timedelta(days=int(span_days * i / max(1, n_activities)) + rng.randint(0, 10))
+        finish = start + timedelta(days=duration_days)
+        target_hr = duration_days * HOURS_PER_DAY
+
+        if finish <= DATA_DATE:
+            status, pct, act_start, act_end, remain_hr = "TK_Complete", 100.0, start, finish, 0.0
+        elif start <= DATA_DATE:
+            pct = float(rng.randint(5, 95))
+            status, act_start, act_end = "TK_Active", start, None
+            remain_hr = round(target_hr * (1 - pct / 100), 1)
+        else:
+            status, pct, act_start, act_end, remain_hr = "TK_NotStart", 0.0, None, None, target_hr
+
+        task_rows.append((
+            task_id, 1, wbs_id, 1, pct, "CP_Phys", "TT_Task", "DT_FixedDur", status,
+            f"A{task_id:07d}", f"Activity {task_id}",
+            target_hr, remain_hr, target_hr * pct / 100, target_hr - target_hr * pct / 100, target_hr,
+            _fmt(act_start), _fmt(act_end), _fmt(start), _fmt(finish),
+            _fmt(act_start or start), _fmt(act_end or finish), _fmt(None if act_end else max(start, DATA_DATE)),
+            _fmt(None if act_end else max(finish, DATA_DATE)),
+            "Y", f"TASK{task_id}", now, USER, now, USER,
+        ))
+
+        if i:
+            window_start = max(1, task_id - PRED_WINDOW)
+            for pred_task_id in {rng.randint(window_start, task_id - 1) for _ in range(_predecessor_count(rng))}:
+                lag = float(rng.choice((-2, 1, 2, 5)) * HOURS_PER_DAY) if rng.random() < 0.2 else 0.0
+                pred_rows.append((pred_id, task_id, pred_task_id, 1, 1, _pick_pred_type(rng), lag,
+                                  now, USER, now, USER))
+                pred_id += 1
+
+        if rng.random() < RESOURCE_ASSIGNMENT_RATE:
+            target_qty = target_hr * rng.choice((1, 1, 2, 3))
+            rate = rng.choice((45.0, 60.0, 85.0, 120.0))
+            act_qty = target_qty * pct / 100
+            rsrc_rows.append((
+                rsrc_id, task_id, 1, rng.randint(1, role_count), None,
+                target_qty - act_qty, target_qty, act_qty, 0.0,
+                target_qty * rate, act_qty * rate * rng.uniform(0.9, 1.2), 0.0, (target_qty - act_qty) * rate,
+                _fmt(act_start), _fmt(act_end), _fmt(start), _fmt(finish),
+                now, USER, now, USER,
+            ))
+            rsrc_id += 1
+
+        # Flush in chunks so 1M-activity databases do not hold everything in memory.
+        if len(task_rows) >= 50_000:
+            _flush_tasks(cursor, task_rows, pred_rows, rsrc_rows)
+
+    _flush_tasks(cursor, task_rows, pred_rows, rsrc_rows)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _flush_tasks(cursor, task_rows, pred_rows, rsrc_rows):
+    cursor.executemany(f"INSERT INTO TASK VALUES ({', '.join('?' * 30)})", task_rows)
+    cursor.executemany(f"INSERT INTO TASKPRED VALUES ({', '.join('?' * 11)})", pred_rows)
+    cursor.executemany(f"INSERT INTO TASKRSRC VALUES ({', '.join('?' * 21)})", rsrc_rows)
+    task_rows.clear()
+    pred_rows.clear()
+    rsrc_rows.clear()
+
+
+def generate_workload(data_dir, n_activities, seed=0):
+    """
+    Writes obs.csv, wbs.csv, roles.csv and activities.csv describing
+    `n_activities` new activities (codes 'WL-0000001', ...) with their own WBS
+    tree and relationships. Names do not collide with generate_database(), so
+    the workload can be loaded on top of a database of any size.
+    """
+    rng = random.Random(seed + 1)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    obs_count = max(5, n_activities // 1000)
+    with open(data_dir / "obs.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["OBS_Name", "Parent_OBS_Name"])
+        writer.writerow(["Workload Enterprise", ""])
+        for i in range(1, obs_count + 1):
+            parent = "Workload Enterprise" if i < 3 else f"Workload OBS {rng.randint(1, i - 1)}"
+            writer.writerow([f"Workload OBS {i}", parent])
+
+    with open(data_dir / "roles.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Role_Name", "Role_Short_Name", "Parent_Role_Name"])
+        for i in range(1, 41):
+            parent = f"Workload Role {rng.randint(1, i - 1)}" if i > 5 else ""
+            writer.writerow([f"Workload Role {i}", f"WLR{i}", parent])
+
+    wbs_count = max(1, n_activities // ACTIVITIES_PER_WBS)
+    wbs_parents = _wbs_tree(rng, wbs_count)
+    with open(data_dir / "wbs.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["WBS Short Name", "WBS Name", "Parent WBS Name"])
+        for i, parent in enumerate(wbs_parents):
+            writer.writerow([f"WL{i + 1}", f"Workload WBS {i + 1}", "" if parent < 0 else f"Workload WBS {parent + 1}"])
+
+    with open(data_dir / "activities.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Activity_ID", "Activity_Name", "Duration_Days", "WBS_Name", "Predecessors"])
+        for i in range(1, n_activities + 1):
+            predecessors = []
+            if i > 1:
+                window_start = max(1, i - PRED_WINDOW)
+                for pred in sorted({rng.randint(window_start, i - 1) for _ in range(_predecessor_count(rng))}):
+                    pred_type = _pick_pred_type(rng)[3:]
+                    lag = f"{rng.choice(('+', '-'))}{rng.randint(1, 5)}d" if rng.random() < 0.2 else ""
+                    predecessors.append(f"WL-{pred:07d}[{pred_type}{lag}]")
+            writer.writerow([
+                f"WL-{i:07d}", f"Workload Activity {i}", rng.choice((1, 2, 3, 5, 10, 15, 20, 30)),
+                f"Workload WBS {rng.randint(1, wbs_count)}", ", ".join(predecessors),
+            ])
+    return data_dir
+
+# --- END OF FILE benchmarks/synthetic.py ---
@@ -0,0 +1,11 @@
+# The public API is resolved lazily so that `pyp6-*` entry points, which import
+# pyp6.scripts.*, do not load the library modules they never use.
+
+__all__ = ["P6Database", "P6Project"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from pyp6 import project
+        return getattr(project, name)
+    raise AttributeError(f"module 'pyp6' has no attribute '{name}'")
@@ -1,15 +1,18 @@
+import re
 import sqlite3
 import time
 
 
-def get_project_defaults(cursor, project_short_name):
+def get_project_defaults(cursor, project_short_name, verbose=True):
     """
     Retrieves the proj_id, root wbs_id, and default clndr_id for the target project.
     This requires a two-step lookup:
     1. Get proj_id and clndr_id from the PROJECT table.
     2. Get the root wbs_id from the PROJWBS table where the proj_node_flag is 'Y' for that project.
+    Progress messages are printed only when verbose is true.
     """
-    print(f"Fetching project defaults for '{project_short_name}'...")
+    if verbose:
+        print(f"Fetching project defaults for '{project_short_name}'...")
 
     # Step 1: Get the project's internal ID and default calendar from the PROJECT table.
     project_query = "SELECT proj_id, clndr_id FROM PROJECT WHERE proj_short_name = ?"
@@ -24,7 +27,8 @@ def get_project_defaults(cursor, project_short_name):
     if not clndr_id:
         raise ValueError(f"Project '{project_short_name}' does not have a default calendar assigned in the database.")
 
-    print(f"Found Project ID: {proj_id}, Default Calendar ID: {clndr_id}")
+    if verbose:
+        print(f"Found Project ID: {proj_id}, Default Calendar ID: {clndr_id}")
 
     # Step 2: Find the root WBS for this project in the PROJWBS table.
     # The root WBS node is identified by having proj_node_flag = 'Y'.
@@ -37,7 +41,8 @@ def get_project_defaults(cursor, project_short_name):
         raise ValueError(f"Could not find the root WBS node for project '{project_short_name}' (proj_id: {proj_id}). The database may be inconsistent or the project setup is incomplete.")
         
     root_wbs_id, project_obs_id = wbs_result
-    print(f"Found Root WBS ID: {root_wbs_id}")
+    if verbose:
+        print(f"Found Root WBS ID: {root_wbs_id}")
     
     return proj_id, root_wbs_id, clndr_id, project_obs_id
 
@@ -62,3 +67,126 @@ def get_next_task_id(cursor):
     cursor.execute("SELECT MAX(task_id) FROM TASK")
     max_id = cursor.fetchone()[0]
     return (max_id or 0) + 1  # Start from 1 if the table is empty
+
+
+def build_wbs_cache(cursor, proj_id, verbose=True):
+    """Queries all WBS elements for a given project and returns a dictionary mapping WBS Name to wbs_id."""
+    if verbose:
+        print("Building WBS cache for the project...")
+    wbs_cache = {}
+    query = "SELECT wbs_name, wbs_id FROM PROJWBS WHERE proj_id = ?"
+    cursor.execute(query, (proj_id,))
+    results = cursor.fetchall()
+    for wbs_name, wbs_id in results:
+        wbs_cache[wbs_name] = wbs_id
+    if not wbs_cache:
+        raise ValueError(
+            f"No WBS elements found for project with proj_id: {proj_id}. Please add WBS first."
+        )
+    if verbose:
+        print(f"  -> WBS cache built successfully with {len(wbs_cache)} entries.")
+    return wbs_cache
+
+
+def build_task_code_map(cursor, proj_id, verbose=True):
+    """
+    Queries ALL existing activities in the project and returns a dictionary
+    mapping their task_code to their internal task_id. This allows linking to
+    pre-existing activities not in the current CSV.
+    """
+    if verbose:
+        print("Building cache of existing activities from the database...")
+    task_map = {}
+    query = "SELECT task_code, task_id FROM TASK WHERE proj_id = ?"
+    cursor.execute(query, (proj_id,))
+    results = cursor.fetchall()
+    for task_code, task_id in results:
+        task_map[task_code] = task_id
+    if verbose:
+        print(f"  -> Activity cache built successfully with {len(task_map)} entries.")
+    return task_map
+
+
+def parse_relationship(relationship_str, hours_per_day):
+    """Parses a relationship string like 'A1000[SS+5d]' into components."""
+    pred_type = "FS"
+    lag_hours = 0.0
+    match = re.match(
+        r"^\s*([a-zA-Z0-9.-]+)\s*(?:\[\s*(\w{2})\s*([+-]?\d+[dh])?\s*\])?\s*$",
+        relationship_str,
+    )
+    if not match:
+        raise ValueError(f"Invalid relationship format: '{relationship_str}'")
+    pred_activity_id, p_type, lag_str = match.groups()
+    if p_type:
+        pred_type = p_type.upper()
+        if pred_type not in ["FS", "SS", "FF", "SF"]:
+            raise ValueError(
+                f"Invalid relationship type '{pred_type}' in '{relationship_str}'"
+            )
+    if lag_str:
+        lag_val = int(re.findall(r"[+-]?\d+", lag_str)[0])
+        lag_hours = (
+            float(lag_val * hours_per_day)
+            if lag_str.endswith("d")
+            else float(lag_val)
+        )
+    return pred_activity_id, "PR_" + pred_type, lag_hours
+
+
+def get_wbs_outline(cursor, proj_id):
+    """
+    Returns the project's WBS as a list of (wbs_id, wbs_short_name, wbs_name, depth, parent_pos)
+    in outline order: the project root first (depth 0, parent_pos -1), and every
+    element after its parent, so parent_pos always points to an earlier entry.
+    Elements whose parent is missing are placed directly under the project root.
+    """
+    cursor.execute(
+        "SELECT wbs_id, parent_wbs_id, wbs_short_name, wbs_name, proj_node_flag "
+        "FROM PROJWBS WHERE proj_id = ? ORDER BY seq_num, wbs_short_name",
+        (proj_id,),
+    )
+    nodes = cursor.fetchall()
+    root = next((row for row in nodes if row[4] == "Y"), None)
+    if root is None:
+        return []
+    known = {row[0] for row in nodes}
+    children = {}
+    for wbs_id, parent_wbs_id, short_name, name, proj_node_flag in nodes:
+        if wbs_id == root[0]:
+            continue
+        parent = parent_wbs_id if parent_wbs_id in known else root[0]
+        children.setdefault(parent, []).append((wbs_id, short_name, name))
+
+    outline = []
+    stack = [((root[0], root[2], root[3]), 0, -1)]
+    while stack:
+        (wbs_id, short_name, name), depth, parent_pos = stack.pop()
+        pos = len(outline)
+        outline.append((wbs_id, short_name, name, depth, parent_pos))
+        stack.extend((child, depth + 1, pos) for child in reversed(children.get(wbs_id, [])))
+    return outline
+
+
+class IdAllocator:
+    """
+    Hands out consecutive primary keys per table.
+    The MAX() lookup is done once per table; later IDs come from memory, so
+    callers must go through the same allocator for every insert they make.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self._next_ids = {}
+
+    def next(self, table_name, id_column):
+        key = (table_name, id_column)
+        if key not in self._next_ids:
+            self._next_ids[key] = get_next_id(self.cursor, table_name, id_column)
+        new_id = self._next_ids[key]
+        self._next_ids[key] = new_id + 1
+        return new_id
+
+    def reset(self):
+        """Forgets all allocated IDs so the next call re-reads MAX() from the database."""
+        self._next_ids.clear()
@@ -0,0 +1,217 @@
+# --- START OF FILE src/pyp6/earned_value.py ---
+"""
+Earned value and progress roll-up over the WBS.
+
+compute_earned_value() returns, for every WBS element of a project, the
+budget (BAC), planned value (PV), earned value (EV), actual cost (AC), the
+derived SV/CV/SPI/CPI, an estimate to complete (ETC/EAC) and two percent
+complete measures, all rolled up from the activities beneath it.
+
+The work is split in two:
+  1. One SQL aggregation computes each activity's values (percent complete,
+     planned fraction at the data date, earned fraction for the WBS's earned
+     value technique) and sums them per WBS element. SQLite does the
+     per-activity arithmetic, so Python never loops over activities.
+  2. The per-WBS sums are held as columns (one list per measure, indexed by
+     outline position) and rolled up in a single reverse pass over the
+     parent-index array. Children always come after their parent in outline
+     order, so each element's totals are complete before they are added into
+     its parent.
+
+Costs come from the TASKRSRC resource assignments (target, actual regular and
+overtime, remaining cost). Project expenses are not included. Planned value
+spreads each activity's budget linearly between its planned (target) start
+and finish, in calendar time.
+"""
+
+from datetime import datetime
+
+from pyp6.access_p6 import get_wbs_outline
+from pyp6.progress import parse_date
+
+# Per-WBS sums, one row per WBS element that has activities.
+# pct      : activity percent complete as a fraction, per complete_pct_type
+# pv_frac  : share of the planned duration elapsed at the data date
+# ev_frac  : share of budget earned, per the WBS's ev_compute_type
+# weight   : activity weight for the weighted percent complete (planned duration, at least 1 hour)
+WBS_SUMS_SQL = """
+    SELECT wbs_id,
+           COUNT(*),
+           SUM(bac),
+           SUM(ac),
+           SUM(remain),
+           SUM(bac * pv_frac),
+           SUM(bac * CASE ev_compute_type
+                         WHEN 'EC_0_100' THEN CASE WHEN status_code = 'TK_Complete' THEN 1.0 ELSE 0.0 END
+                         WHEN 'EC_50_50' THEN CASE status_code WHEN 'TK_Complete' THEN 1.0
+                                                               WHEN 'TK_Active' THEN 0.5 ELSE 0.0 END
+                         ELSE pct
+                     END),
+           SUM(weight),
+           SUM(weight * pct)
+    FROM (
+        SELECT t.wbs_id, t.status_code, w.ev_compute_type,
+               COALESCE(r.bac, 0.0) AS bac,
+               COALESCE(r.ac, 0.0) AS ac,
+               COALESCE(r.remain, 0.0) AS remain,
+               MAX(COALESCE(t.target_drtn_hr_cnt, 0.0), 1.0) AS weight,
+               CASE
+                   WHEN t.status_code = 'TK_Complete' THEN 1.0
+                   WHEN t.complete_pct_type = 'CP_Phys' THEN MIN(MAX(COALESCE(t.phys_complete_pct, 0.0) / 100.0, 0.0), 1.0)
+                   WHEN t.status_code = 'TK_NotStart' THEN 0.0
+                   WHEN t.complete_pct_type = 'CP_Units' THEN
+                       CASE WHEN COALESCE(t.act_work_qty, 0) + COALESCE(t.remain_work_qty, 0) > 0
+                            THEN COALESCE(t.act_work_qty, 0) / (COALESCE(t.act_work_qty, 0) + COALESCE(t.remain_work_qty, 0))
+                            ELSE 0.0 END
+                   ELSE
+                       CASE WHEN t.target_drtn_hr_cnt > 0
+                            THEN MIN(MAX((t.target_drtn_hr_cnt - COALESCE(t.remain_drtn_hr_cnt, 0)) / t.target_drtn_hr_cnt, 0.0), 1.0)
+                            ELSE 0.0 END
+               END AS pct,
+               CASE
+                   WHEN t.target_start_date IS NULL OR t.target_end_date IS NULL THEN 0.0
+                   -- P6 dates are ISO strings, so plain comparisons settle finished and
+                   -- unstarted work; julianday() is only needed for activities in between.
+                   WHEN t.target_end_date <= :data_date THEN 1.0
+                   WHEN t.target_start_date >= :data_date THEN 0.0
+                   ELSE (julianday(:data_date) - julianday(t.target_start_date))
+                        / (julianday(t.target_end_date) - julianday(t.target_start_date))
+               END AS pv_frac
+        FROM TASK t
+        JOIN PROJWBS w ON w.wbs_id = t.wbs_id
+        LEFT JOIN (
+            SELECT task_id,
+                   SUM(COALESCE(target_cost, 0)) AS bac,
+                   SUM(COALESCE(act_reg_cost, 0) + COALESCE(act_ot_cost, 0)) AS ac,
+                   SUM(COALESCE(remain_cost, 0)) AS remain
+            FROM TASKRSRC
+            WHERE proj_id = :proj_id
+            GROUP BY task_id
+        ) r ON r.task_id = t.task_id
+        WHERE t.proj_id = :proj_id
+    )
+    GROUP BY wbs_id
+"""
+
+# Column order of WBS_SUMS_SQL after wbs_id.
+_SUM_COLUMNS = ("activity_count", "bac", "ac", "remain_cost", "pv", "ev", "weight", "weighted_pct")
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else None
+
+
+def _estimate_to_complete(etc_type, bac, ev, remain_cost, cpi, spi):
+    """ETC per the WBS's ev_etc_compute_type; performance factors fall back to 1 when undefined."""
+    if etc_type == "EE_PF_1":
+        return bac - ev
+    if etc_type == "EE_PF_cpi":
+        return (bac - ev) / (cpi or 1.0)
+    if etc_type == "EE_PF_cpi_spi":
+        return (bac - ev) / ((cpi or 1.0) * (spi or 1.0))
+    return remain_cost  # EE_Rem_hr and anything else: the remaining cost of the activities
+
+
+def compute_earned_value(cursor, project_short_name, data_date=None):
+    """
+    Computes earned value for every WBS element of `project_short_name`.
+
+    data_date defaults to the project's last recalculation date (PROJECT.last_recalc_date);
+    pass a 'YYYY-MM-DD[ HH:MM:SS]' string or a datetime to evaluate at another date.
+    An unparsable date raises ValueError.
+
+    Returns a list of dicts in outline order (project root first) with keys:
+    wbs_id, parent_wbs_id, wbs_short_name, wbs_name, depth, activity_count,
+    bac, pv, ev, ac, sv, cv, spi, cpi, etc, eac, performance_pct, weighted_pct.
+    performance_pct is EV / BAC. weighted_pct is the percent complete of the
+    activities weighted by planned duration, with each WBS element's subtree
+    additionally weighted by its est_wt when it rolls into its parent.
+    Ratios whose denominator is zero are None.
+    """
+    cursor.execute(
+        "SELECT proj_id, last_recalc_date FROM PROJECT WHERE proj_short_name = ?",
+        (project_short_name,),
+    )
+    project_row = cursor.fetchone()
+    if not project_row:
+        raise ValueError(f"Project with short name '{project_short_name}' not found in the PROJECT table.")
+    proj_id, last_recalc_date = project_row
+    data_date = data_date or last_recalc_date
+    if not data_date:
+        raise ValueError(f"Project '{project_short_name}' has no data date (last_recalc_date); pass one explicitly.")
+    if not isinstance(data_date, datetime):
+        data_date = parse_date(data_date)
+    # P6 stores dates as 'YYYY-MM-DD HH:MM:SS' text, which the query compares directly.
+    data_date = data_date.strftime("%Y-%m-%d %H:%M:%S")
+
+    outline = get_wbs_outline(cursor, proj_id)
+    if not outline:
+        raise ValueError(f"Could not find the root WBS node for project '{project_short_name}' (proj_id: {proj_id}).")
+    position = {node[0]: pos for pos, node in enumerate(outline)}
+    parent = [node[4] for node in outline]
+    count = len(outline)
+
+    cursor.execute(
+        "SELECT wbs_id, est_wt, ev_etc_compute_type FROM PROJWBS WHERE proj_id = ?", (proj_id,)
+    )
+    est_wt = [1.0] * count
+    etc_type = [None] * count
+    for wbs_id, weight, etc_compute_type in cursor.fetchall():
+        pos = position.get(wbs_id)
+        if pos is not None:
+            est_wt[pos] = weight if weight is not None else 1.0
+            etc_type[pos] = etc_compute_type
+
+    # --- Columnar per-WBS sums from the activities directly under each element ---
+    columns = {name: [0.0] * count for name in _SUM_COLUMNS}
+    cursor.execute(WBS_SUMS_SQL, {"proj_id": proj_id, "data_date": data_date})
+    for row in cursor.fetchall():
+        pos = position.get(row[0])
+        if pos is None:
+            continue
+        for name, value in zip(_SUM_COLUMNS, row[1:]):
+            columns[name][pos] = value or 0.0
+
+    # --- Roll-up: one reverse pass over the parent-index array ---
+    activity_count, bac, ac, remain_cost, pv, ev, weight, weighted_pct = (columns[name] for name in _SUM_COLUMNS)
+    for pos in range(count - 1, 0, -1):
+        p = parent[pos]
+        activity_count[p] += activity_count[pos]
+        bac[p] += bac[pos]
+        ac[p] += ac[pos]
+        remain_cost[p] += remain_cost[pos]
+        pv[p] += pv[pos]
+        ev[p] += ev[pos]
+        weight[p] += est_wt[pos] * weight[pos]
+        weighted_pct[p] += est_wt[pos] * weighted_pct[pos]
+
+    results = []
+    for pos, (wbs_id, short_name, name, depth, parent_pos) in enumerate(outline):
+        spi = _ratio(ev[pos], pv[pos])
+        cpi = _ratio(ev[pos], ac[pos])
+        etc = _estimate_to_complete(etc_type[pos], bac[pos], ev[pos], remain_cost[pos], cpi, spi)
+        performance = _ratio(ev[pos], bac[pos])
+        weighted = _ratio(weighted_pct[pos], weight[pos])
+        results.append({
+            "wbs_id": wbs_id,
+            "parent_wbs_id": outline[parent_pos][0] if parent_pos >= 0 else None,
+            "wbs_short_name": short_name,
+            "wbs_name": name,
+            "depth": depth,
+            "activity_count": int(activity_count[pos]),
+            "bac": bac[pos],
+            "pv": pv[pos],
+            "ev": ev[pos],
+            "ac": ac[pos],
+            "sv": ev[pos] - pv[pos],
+            "cv": ev[pos] - ac[pos],
+            "spi": spi,
+            "cpi": cpi,
+            "etc": etc,
+            "eac": ac[pos] + etc,
+            "performance_pct": performance * 100 if performance is not None else None,
+            "weighted_pct": weighted * 100 if weighted is not None else None,
+        })
+    return results
+
+# --- END OF FILE src/pyp6/earned_value.py ---
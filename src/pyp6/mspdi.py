@@ -0,0 +1,481 @@
+# --- START OF FILE src/pyp6/mspdi.py ---
+"""
+MS Project XML (MSPDI) export and import without MS Project or COM automation.
+
+export_mspdi() streams a P6 project (PROJWBS, TASK, TASKPRED, CALENDAR) from
+the SQLite database into an MSPDI file: WBS elements become summary tasks and
+activities become tasks underneath them. Rows are read with cursors and
+written as they arrive, so memory use depends on the WBS size, not the number
+of activities.
+
+import_mspdi() reads an MSPDI file with iterparse and loads it into a P6
+project through P6Project: summary tasks become WBS elements, other tasks
+become activities, and predecessor links become relationships.
+
+Activity IDs are carried in the Text1 custom field ("Activity ID"), so a
+project exported here and imported back keeps its activity codes.
+Resources, assignments and baselines are not exported.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+from pyp6.access_p6 import get_wbs_outline
+
+MSPDI_NAMESPACE = "http://schemas.microsoft.com/project"
+NS = "{" + MSPDI_NAMESPACE + "}"
+TASK_TAG = NS + "Task"
+LINK_TAG = NS + "PredecessorLink"
+ATTRIBUTE_TAG = NS + "ExtendedAttribute"
+
+# Text1; MS Project identifies custom fields by these fixed numbers.
+ACTIVITY_ID_FIELD = "188743731"
+
+# P6 pred_type <-> MSPDI PredecessorLink/Type
+LINK_TYPES = {"PR_FF": 0, "PR_FS": 1, "PR_SF": 2, "PR_SS": 3}
+P6_LINK_TYPES = {value: key for key, value in LINK_TYPES.items()}
+
+MILESTONE_TYPES = ("TT_Mile", "TT_FinMile")
+DURATION_FORMAT_DAYS = 7
+LAG_FORMAT_DAYS = 7
+
+DEFAULT_WORK_TIMES = (("08:00", "12:00"), ("13:00", "17:00"))
+P6_EPOCH = datetime(1899, 12, 30)  # P6 stores calendar exception dates as day numbers from this date
+
+
+# --- XML Writer ---
+
+class _XmlWriter:
+    """
+    A minimal buffered XML writer; much faster than building a tree for large projects.
+    Output is unindented (as MS Project writes it), which also roughly halves the time
+    needed to parse the file back.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = []
+
+    def start(self, tag, attrs=""):
+        self.buffer.append(f"<{tag}{attrs}>")
+
+    def end(self, tag):
+        self.buffer.append(f"</{tag}>")
+        if len(self.buffer) > 5000:
+            self.flush()
+
+    def leaf(self, tag, value):
+        if value is None:
+            return
+        if isinstance(value, str):
+            value = escape(value)
+        self.buffer.append(f"<{tag}>{value}</{tag}>")
+
+    def flush(self):
+        self.f.write("".join(self.buffer))
+        self.buffer.clear()
+
+
+# --- Conversions ---
+
+def _xml_date(p6_date):
+    """'2025-01-06 08:00:00[.ffffff]' -> '2025-01-06T08:00:00'."""
+    if not p6_date:
+        return None
+    return str(p6_date)[:19].replace(" ", "T")
+
+
+def _xml_duration(hours):
+    hours = float(hours or 0)
+    whole_hours = int(hours)
+    minutes = int(round((hours - whole_hours) * 60))
+    return f"PT{whole_hours}H{minutes}M0S"
+
+
+_DURATION_RE = re.compile(r"^-?P(?:(\d+(?:\.\d+)?)D)?T?(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?$")
+
+
+def _parse_duration(text, hours_per_day):
+    """Converts an MSPDI duration such as 'PT80H0M0S' to hours."""
+    match = _DURATION_RE.match((text or "").strip())
+    if not match:
+        return 0.0
+    days, hours, minutes, seconds = (float(part) if part else 0.0 for part in match.groups())
+    return days * hours_per_day + hours + minutes / 60 + seconds / 3600
+
+
+def _parse_work_times(clndr_data):
+    """
+    Extracts the weekly work pattern and non-working exception dates from a
+    P6 clndr_data string. Returns ({day 1-7 (Sunday=1): [(from, to), ...]}, [date, ...]),
+    or (None, []) if the string has no recognisable week pattern.
+    """
+    if not clndr_data or "DaysOfWeek" not in clndr_data:
+        return None, []
+    week_part, _, exception_part = clndr_data.partition("Exceptions")
+    week_part = week_part[week_part.index("DaysOfWeek"):]
+
+    time_re = re.compile(r"s\|(\d{1,2}:\d{2})\|f\|(\d{1,2}:\d{2})|f\|(\d{1,2}:\d{2})\|s\|(\d{1,2}:\d{2})")
+    day_starts = [(day, week_part.find(f"(0||{day}()")) for day in range(1, 8)]
+    week = {}
+    for i, (day, start) in enumerate(day_starts):
+        if start < 0:
+            continue
+        following = [pos for _, pos in day_starts[i + 1:] if pos > start]
+        segment = week_part[start:following[0] if following else len(week_part)]
+        periods = []
+        for s1, f1, f2, s2 in time_re.findall(segment):
+            periods.append((s1 or s2, f1 or f2))
+        week[day] = sorted(periods)
+
+    # Non-working exceptions are entries with a date and no work periods: (0||n(d|45000)())
+    holidays = []
+    for day_number, periods in re.findall(r"\(d\|(\d+)\)\((.*?)\)\)", exception_part):
+        if "s|" not in periods:
+            holidays.append(P6_EPOCH + timedelta(days=int(day_number)))
+    return week, holidays
+
+
+# --- Export ---
+
+def _write_calendar(w, clndr_id, clndr_name, clndr_data):
+    week, holidays = _parse_work_times(clndr_data)
+    if week is None:
+        # Unparsable calendar: fall back to a standard Monday-Friday week.
+        week = {day: list(DEFAULT_WORK_TIMES) if 2 <= day <= 6 else [] for day in range(1, 8)}
+
+    w.start("Calendar")
+    w.leaf("UID", clndr_id)
+    w.leaf("Name", clndr_name or f"Calendar {clndr_id}")
+    w.leaf("IsBaseCalendar", 1)
+    w.leaf("BaseCalendarUID", -1)
+    w.start("WeekDays")
+    for day in range(1, 8):
+        periods = week.get(day, [])
+        w.start("WeekDay")
+        w.leaf("DayType", day)
+        w.leaf("DayWorking", 1 if periods else 0)
+        if periods:
+            w.start("WorkingTimes")
+            for from_time, to_time in periods:
+                w.start("WorkingTime")
+                w.leaf("FromTime", f"{from_time.zfill(5)}:00")
+                w.leaf("ToTime", f"{to_time.zfill(5)}:00")
+                w.end("WorkingTime")
+            w.end("WorkingTimes")
+        w.end("WeekDay")
+    for holiday in holidays:
+        w.start("WeekDay")
+        w.leaf("DayType", 0)
+        w.leaf("DayWorking", 0)
+        w.start("TimePeriod")
+        w.leaf("FromDate", holiday.strftime("%Y-%m-%dT00:00:00"))
+        w.leaf("ToDate", holiday.strftime("%Y-%m-%dT23:59:00"))
+        w.end("TimePeriod")
+        w.end("WeekDay")
+    w.end("WeekDays")
+    w.end("Calendar")
+
+
+def export_mspdi(cursor, project_short_name, file_path, hours_per_day=8.0):
+    """
+    Writes the P6 project `project_short_name` to `file_path` as MSPDI XML.
+    Returns the number of activities written.
+    """
+    cursor.execute(
+        "SELECT proj_id, clndr_id, plan_start_date, last_recalc_date FROM PROJECT WHERE proj_short_name = ?",
+        (project_short_name,),
+    )
+    project_row = cursor.fetchone()
+    if not project_row:
+        raise ValueError(f"Project with short name '{project_short_name}' not found in the PROJECT table.")
+    proj_id, project_clndr_id, plan_start_date, status_date = project_row
+
+    wbs_nodes = get_wbs_outline(cursor, proj_id)
+    if not wbs_nodes:
+        raise ValueError(f"Could not find the root WBS node for project '{project_short_name}' (proj_id: {proj_id}).")
+
+    cursor.execute(
+        "SELECT clndr_id, clndr_name, clndr_data FROM CALENDAR WHERE clndr_id = ? "
+        "OR clndr_id IN (SELECT DISTINCT clndr_id FROM TASK WHERE proj_id = ?) ORDER BY clndr_id",
+        (project_clndr_id, proj_id),
+    )
+    calendars = cursor.fetchall()
+
+    cursor.execute("SELECT MAX(task_id) FROM TASK")
+    # Summary tasks need UIDs that cannot clash with activity UIDs (which are P6 task_ids).
+    summary_uid_base = (cursor.fetchone()[0] or 0) + 1
+
+    # Outline position of every WBS node, used to stream activities in outline order.
+    # Filling the temp table opens a transaction on the connection; unless the
+    # caller already had one open, it is committed again (with nothing but the
+    # temp table in it) so the connection does not keep holding a lock.
+    conn = cursor.connection
+    owns_transaction = not conn.in_transaction
+    conn.execute("DROP TABLE IF EXISTS temp.mspdi_wbs_order")
+    conn.execute("CREATE TEMP TABLE mspdi_wbs_order (wbs_id INTEGER PRIMARY KEY, pos INTEGER)")
+    task_cursor = pred_cursor = None
+    try:
+        conn.executemany("INSERT INTO temp.mspdi_wbs_order VALUES (?, ?)",
+                         ((node[0], pos) for pos, node in enumerate(wbs_nodes)))
+
+        task_cursor = conn.execute(
+            """
+            SELECT o.pos, t.task_id, t.task_code, t.task_name, t.task_type, t.clndr_id,
+                   t.target_drtn_hr_cnt, t.remain_drtn_hr_cnt, t.phys_complete_pct,
+                   COALESCE(t.act_start_date, t.early_start_date, t.target_start_date),
+                   COALESCE(t.act_end_date, t.early_end_date, t.target_end_date),
+                   t.act_start_date, t.act_end_date
+            FROM TASK t JOIN temp.mspdi_wbs_order o ON o.wbs_id = t.wbs_id
+            WHERE t.proj_id = ?
+            ORDER BY o.pos, t.task_code, t.task_id
+            """,
+            (proj_id,),
+        )
+        # Same ORDER BY as the task query, so links can be merged in without holding them in memory.
+        pred_cursor = conn.execute(
+            """
+            SELECT p.task_id, p.pred_task_id, p.pred_type, p.lag_hr_cnt
+            FROM TASKPRED p
+            JOIN TASK t ON t.task_id = p.task_id
+            JOIN temp.mspdi_wbs_order o ON o.wbs_id = t.wbs_id
+            WHERE p.proj_id = ? AND p.pred_proj_id = p.proj_id
+            ORDER BY o.pos, t.task_code, t.task_id
+            """,
+            (proj_id,),
+        )
+
+        written = 0
+        with open(file_path, "w", encoding="utf-8") as f:
+            w = _XmlWriter(f)
+            w.buffer.append('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+            w.start("Project", f' xmlns="{MSPDI_NAMESPACE}"')
+            w.leaf("SaveVersion", 14)
+            w.leaf("Name", f"{project_short_name}.xml")
+            w.leaf("Title", wbs_nodes[0][2] or project_short_name)
+            w.leaf("ScheduleFromStart", 1)
+            w.leaf("StartDate", _xml_date(plan_start_date))
+            w.leaf("CalendarUID", project_clndr_id)
+            w.leaf("MinutesPerDay", int(hours_per_day * 60))
+            w.leaf("MinutesPerWeek", int(hours_per_day * 60 * 5))
+            w.leaf("DaysPerMonth", 20)
+            w.leaf("StatusDate", _xml_date(status_date))
+            w.start("ExtendedAttributes")
+            w.start("ExtendedAttribute")
+            w.leaf("FieldID", ACTIVITY_ID_FIELD)
+            w.leaf("FieldName", "Text1")
+            w.leaf("Alias", "Activity ID")
+            w.end("ExtendedAttribute")
+            w.end("ExtendedAttributes")
+
+            w.start("Calendars")
+            for clndr_id, clndr_name, clndr_data in calendars:
+                _write_calendar(w, clndr_id, clndr_name, clndr_data)
+            w.end("Calendars")
+
+            w.start("Tasks")
+            outline = []  # running outline number, e.g. [2, 1, 3] -> "2.1.3"
+            row_id = 0
+            pred = next(pred_cursor, None)
+            task = next(task_cursor, None)
+
+            def start_task(uid, name, code, level):
+                """Opens a <Task> and writes the identity and outline fields shared by all rows."""
+                nonlocal row_id
+                del outline[level:]
+                if level:
+                    if len(outline) < level:
+                        outline.append(0)
+                    outline[level - 1] += 1
+                w.start("Task")
+                w.leaf("UID", uid)
+                w.leaf("ID", row_id)
+                w.leaf("Name", name or code or "")
+                w.leaf("OutlineNumber", ".".join(map(str, outline[:level])) if level else "0")
+                w.leaf("OutlineLevel", level)
+                row_id += 1
+
+            for pos, (_, short_name, name, depth, _) in enumerate(wbs_nodes):
+                # The project root becomes the project summary task, which MSPDI requires to have UID 0.
+                start_task(summary_uid_base + pos if depth else 0, name, short_name, depth)
+                w.leaf("Summary", 1)
+                w.start("ExtendedAttribute")
+                w.leaf("FieldID", ACTIVITY_ID_FIELD)
+                w.leaf("Value", short_name or "")
+                w.end("ExtendedAttribute")
+                w.end("Task")
+
+                while task is not None and task[0] == pos:
+                    (_, task_id, task_code, task_name, task_type, clndr_id, target_hr, remain_hr,
+                     pct, start, finish, act_start, act_finish) = task
+                    start_task(task_id, task_name, task_code, depth + 1)
+                    w.leaf("Start", _xml_date(start))
+                    w.leaf("Finish", _xml_date(finish))
+                    w.leaf("Duration", _xml_duration(target_hr))
+                    w.leaf("DurationFormat", DURATION_FORMAT_DAYS)
+                    w.leaf("Milestone", 1 if task_type in MILESTONE_TYPES else 0)
+                    w.leaf("Summary", 0)
+                    w.leaf("PercentComplete", int(round(pct or 0)))
+                    w.leaf("ActualStart", _xml_date(act_start))
+                    w.leaf("ActualFinish", _xml_date(act_finish))
+                    w.leaf("RemainingDuration", _xml_duration(remain_hr))
+                    w.leaf("CalendarUID", clndr_id)
+                    w.leaf("PhysicalPercentComplete", int(round(pct or 0)))
+
+                    while pred is not None and pred[0] == task_id:
+                        _, pred_task_id, pred_type, lag_hr = pred
+                        w.start("PredecessorLink")
+                        w.leaf("PredecessorUID", pred_task_id)
+                        w.leaf("Type", LINK_TYPES.get(pred_type, 1))
+                        w.leaf("LinkLag", int(round((lag_hr or 0) * 600)))  # tenths of a minute
+                        w.leaf("LagFormat", LAG_FORMAT_DAYS)
+                        w.end("PredecessorLink")
+                        pred = next(pred_cursor, None)
+
+                    w.start("ExtendedAttribute")
+                    w.leaf("FieldID", ACTIVITY_ID_FIELD)
+                    w.leaf("Value", task_code)
+                    w.end("ExtendedAttribute")
+                    w.end("Task")
+                    written += 1
+                    task = next(task_cursor, None)
+
+            w.end("Tasks")
+            w.end("Project")
+            w.flush()
+    finally:
+        for open_cursor in (task_cursor, pred_cursor):
+            if open_cursor is not None:
+                open_cursor.close()
+        conn.execute("DROP TABLE IF EXISTS temp.mspdi_wbs_order")
+        if owns_transaction:
+            conn.commit()
+    return written
+
+
+# --- Import ---
+
+def iter_mspdi_tasks(file_path, hours_per_day=8.0):
+    """
+    Streams the tasks of an MSPDI file with iterparse, yielding one dict per task:
+    uid, name, code (Text1), outline_level, summary, duration_hours,
+    percent_complete, start, finish and predecessors [(pred_uid, link type, lag hours)].
+    Processed elements are discarded, so memory stays flat for large files.
+    """
+    tasks_elem = None
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if elem.tag == NS + "Tasks":
+                tasks_elem = elem
+            continue
+
+        if elem.tag == NS + "MinutesPerDay" and elem.text and elem.text.strip().isdigit():
+            hours_per_day = int(elem.text) / 60 or hours_per_day
+        elif elem.tag == TASK_TAG and tasks_elem is not None:
+            fields = {}
+            code = None
+            predecessors = []
+            # One pass over the children is much cheaper than a findtext() per field.
+            for child in elem:
+                tag = child.tag
+                if tag == LINK_TAG:
+                    link = {grandchild.tag: grandchild.text for grandchild in child}
+                    predecessors.append((
+                        link.get(NS + "PredecessorUID"),
+                        int(link.get(NS + "Type") or 1),
+                        float(link.get(NS + "LinkLag") or 0) / 600,  # tenths of a minute -> hours
+                    ))
+                elif tag == ATTRIBUTE_TAG:
+                    attribute = {grandchild.tag: grandchild.text for grandchild in child}
+                    if attribute.get(NS + "FieldID") == ACTIVITY_ID_FIELD:
+                        code = attribute.get(NS + "Value")
+                else:
+                    fields[tag] = child.text
+            yield {
+                "uid": fields.get(NS + "UID"),
+                "name": fields.get(NS + "Name") or "",
+                "code": code,
+                "outline_level": int(fields.get(NS + "OutlineLevel") or 1),
+                "summary": fields.get(NS + "Summary") == "1",
+                "duration_hours": _parse_duration(fields.get(NS + "Duration"), hours_per_day),
+                "percent_complete": float(fields.get(NS + "PercentComplete") or 0),
+                "start": fields.get(NS + "Start"),
+                "finish": fields.get(NS + "Finish"),
+                "predecessors": predecessors,
+            }
+            tasks_elem.clear()
+
+
+def import_mspdi(project, file_path):
+    """
+    Loads an MSPDI file into a P6Project in one transaction. Summary tasks become
+    WBS elements and the other tasks become activities with their relationships.
+    Tasks without an Activity ID (Text1) get 'MSP<UID>'. A summary task reuses
+    an existing WBS element only if one with the same name sits under the same
+    parent, so summaries that share a name keep their own place in the outline.
+    Existing activity codes and relationships are reused, as with the CSV
+    loaders, so importing the same file again adds nothing.
+    Returns (number of WBS rows, number of activity rows) read from the file,
+    the number of relationships created and the skipped links as
+    (successor, predecessor, reason) tuples.
+    """
+    wbs_rows = []  # (short name, name, position of the parent summary in wbs_rows or -1 for the root)
+    activity_rows, activity_wbs_pos = [], []
+    uid_to_code = {}
+    summary_path = []  # positions in wbs_rows of the summary tasks above the current row, by outline level
+    links = []
+
+    for task in iter_mspdi_tasks(file_path, project.hours_per_day):
+        level = task["outline_level"]
+        if level == 0:
+            continue  # project summary task; maps to the P6 project root
+        del summary_path[level - 1:]
+        parent_pos = summary_path[-1] if summary_path else -1
+
+        if task["summary"]:
+            summary_path.append(len(wbs_rows))
+            wbs_rows.append((task["code"] or task["uid"], task["name"], parent_pos))
+            continue
+
+        code = task["code"] or f"MSP{task['uid']}"
+        uid_to_code[task["uid"]] = code
+        activity_rows.append({
+            "Activity_ID": code,
+            "Activity_Name": task["name"],
+            "Duration_Days": task["duration_hours"] / project.hours_per_day,
+        })
+        activity_wbs_pos.append(parent_pos)
+        links.extend((code, pred_uid, link_type, lag_hours) for pred_uid, link_type, lag_hours in task["predecessors"])
+
+    with project.transaction():
+        # WBS elements are matched by (parent wbs_id, name), never by name alone.
+        project.cursor.execute("SELECT parent_wbs_id, wbs_name, wbs_id FROM PROJWBS WHERE proj_id = ?",
+                               (project.proj_id,))
+        existing = {}
+        for parent_wbs_id, wbs_name, wbs_id in project.cursor.fetchall():
+            existing.setdefault((parent_wbs_id, wbs_name), wbs_id)
+
+        wbs_ids = []
+        for index, (short_name, name, parent_pos) in enumerate(wbs_rows):
+            parent_wbs_id = wbs_ids[parent_pos] if parent_pos >= 0 else project.root_wbs_id
+            wbs_id = existing.get((parent_wbs_id, name))
+            if wbs_id is None:
+                wbs_id = project.create_wbs(short_name, name, parent_wbs_id, index)
+                existing[(parent_wbs_id, name)] = wbs_id
+            wbs_ids.append(wbs_id)
+
+        for row, pos in zip(activity_rows, activity_wbs_pos):
+            row["wbs_id"] = wbs_ids[pos] if pos >= 0 else project.root_wbs_id
+        project.add_activities(activity_rows)
+
+        # Predecessors may appear later in the file, so links are resolved once all codes are known.
+        link_count, skipped_links = project.add_links(
+            (code, uid_to_code[pred_uid], P6_LINK_TYPES.get(link_type, "PR_FS"), lag_hours)
+            for code, pred_uid, link_type, lag_hours in links
+            if pred_uid in uid_to_code
+        )
+    return len(wbs_rows), len(activity_rows), link_count, skipped_links
+
+# --- END OF FILE src/pyp6/mspdi.py ---
@@ -0,0 +1,267 @@
+# --- START OF FILE src/pyp6/progress.py ---
+"""
+Bulk progress updates: actual dates, physical percent complete and remaining
+durations for existing activities, as of a data date.
+
+apply_progress() validates every row before anything is written, then loads
+the resolved updates into a temporary table and applies them to TASK and
+TASKRSRC with set-based UPDATEs inside a single transaction.
+
+Progress CSV columns (only Activity_ID is required; a blank cell leaves the
+current value unchanged):
+    Activity_ID, Actual_Start, Actual_Finish, Physical_Pct_Complete, Remaining_Duration_Days
+
+The activity status follows from its actual dates: an actual finish makes it
+Completed, an actual start makes it In Progress. For activities with
+auto-compute actuals (auto_compute_act_flag = 'Y'), resource assignments get
+actual and remaining units and costs in proportion to the activity's
+duration percent complete. The activity's actual and remaining work
+(act_work_qty, remain_work_qty) are then rolled up from its assignments.
+"""
+
+import sqlite3
+from datetime import datetime
+
+from pyp6.project import clean_text, iter_records
+
+PROGRESS_COLUMNS = ["Activity_ID", "Actual_Start", "Actual_Finish", "Physical_Pct_Complete", "Remaining_Duration_Days"]
+
+# UPDATE ... FROM arrived in SQLite 3.33; older builds use correlated subqueries instead.
+SUPPORTS_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columns set on each table, as expressions over the staged row `u`.
+# Target columns are qualified with the table name so the same expressions
+# work in both the UPDATE ... FROM and the correlated-subquery form.
+TASK_ASSIGNMENTS = {
+    "status_code": "u.status_code",
+    "act_start_date": "u.act_start_date",
+    "act_end_date": "u.act_end_date",
+    "phys_complete_pct": "u.phys_complete_pct",
+    "remain_drtn_hr_cnt": "u.remain_drtn_hr_cnt",
+    "restart_date": "u.restart_date",
+    "update_date": "u.update_date",
+    "update_user": "u.update_user",
+}
+
+TASKRSRC_ASSIGNMENTS = {
+    "act_start_date": "u.act_start_date",
+    "act_end_date": "u.act_end_date",
+    "act_reg_qty": "CASE WHEN u.auto_compute_act_flag = 'Y' THEN COALESCE(TASKRSRC.target_qty, 0) * u.actual_fraction ELSE TASKRSRC.act_reg_qty END",
+    "remain_qty": "CASE WHEN u.auto_compute_act_flag = 'Y' THEN COALESCE(TASKRSRC.target_qty, 0) * (1 - u.actual_fraction) ELSE TASKRSRC.remain_qty END",
+    "act_reg_cost": "CASE WHEN u.auto_compute_act_flag = 'Y' THEN COALESCE(TASKRSRC.target_cost, 0) * u.actual_fraction ELSE TASKRSRC.act_reg_cost END",
+    "remain_cost": "CASE WHEN u.auto_compute_act_flag = 'Y' THEN COALESCE(TASKRSRC.target_cost, 0) * (1 - u.actual_fraction) ELSE TASKRSRC.remain_cost END",
+    "update_date": "u.update_date",
+    "update_user": "u.update_user",
+}
+
+# Activity work quantities rolled up from the updated resource assignments,
+# so units-based percent complete (complete_pct_type = 'CP_Units') follows the update.
+TASK_WORK_ASSIGNMENTS = {
+    "act_work_qty": "u.act_qty",
+    "remain_work_qty": "u.remain_qty",
+}
+
+TASK_WORK_SOURCE = """(
+    SELECT r.task_id,
+           SUM(COALESCE(r.act_reg_qty, 0) + COALESCE(r.act_ot_qty, 0)) AS act_qty,
+           SUM(COALESCE(r.remain_qty, 0)) AS remain_qty
+    FROM TASKRSRC r JOIN temp.progress_update p ON p.task_id = r.task_id
+    GROUP BY r.task_id
+)"""
+
+STAGED_COLUMNS = [
+    "task_id", "status_code", "act_start_date", "act_end_date", "phys_complete_pct",
+    "remain_drtn_hr_cnt", "restart_date", "actual_fraction", "auto_compute_act_flag",
+    "update_date", "update_user",
+]
+
+# Codes per lookup query; stays below SQLite's default limit of 999 bound parameters.
+LOOKUP_CHUNK_SIZE = 900
+
+# Maximum number of validation errors listed in the exception message.
+MAX_REPORTED_ERRORS = 50
+
+
+def parse_date(value):
+    """Parses 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS]' (or with a 'T'); a date without a time is midnight."""
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace(" ", "T") if len(text) > 10 else text)
+    except ValueError:
+        raise ValueError(f"invalid date '{text}' (expected YYYY-MM-DD or YYYY-MM-DD HH:MM)")
+
+
+def _parse_number(value, label):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"invalid {label} '{value}'")
+
+
+def _update_sql(table, assignments, source="temp.progress_update"):
+    """Builds a set-based UPDATE of `table` from the rows of `source` (a table or subquery with a task_id column)."""
+    if SUPPORTS_UPDATE_FROM:
+        set_clause = ", ".join(f"{column} = {expression}" for column, expression in assignments.items())
+        return f"UPDATE {table} SET {set_clause} FROM {source} AS u WHERE {table}.task_id = u.task_id"
+    set_clause = ", ".join(
+        f"{column} = (SELECT {expression} FROM {source} AS u WHERE u.task_id = {table}.task_id)"
+        for column, expression in assignments.items()
+    )
+    return f"UPDATE {table} SET {set_clause} WHERE task_id IN (SELECT task_id FROM {source})"
+
+
+def _load_current_state(cursor, proj_id, codes):
+    """
+    Returns {task_code: row} for the given codes. Codes are looked up in
+    chunks with plain SELECTs, so validation never opens a write transaction
+    (and never holds a lock) on the caller's connection.
+    """
+    unique_codes = list(dict.fromkeys(code for code in codes if code))
+    current = {}
+    for i in range(0, len(unique_codes), LOOKUP_CHUNK_SIZE):
+        chunk = unique_codes[i:i + LOOKUP_CHUNK_SIZE]
+        cursor.execute(
+            f"""
+            SELECT task_code, task_id, status_code, act_start_date, act_end_date,
+                   target_drtn_hr_cnt, remain_drtn_hr_cnt, phys_complete_pct, auto_compute_act_flag
+            FROM TASK
+            WHERE proj_id = ? AND task_code IN ({', '.join('?' * len(chunk))})
+            """,
+            [proj_id] + chunk,
+        )
+        current.update((row[0], row[1:]) for row in cursor.fetchall())
+    return current
+
+
+def _resolve_row(row, state, data_date, hours_per_day):
+    """
+    Validates one progress row against the activity's current state and
+    returns the values to stage, or None if the row changes nothing.
+    Raises ValueError describing the first problem found.
+    """
+    task_id, status, cur_start, cur_finish, target_hr, remain_hr, phys_pct, auto_compute = state
+    start_text = clean_text(row.get("Actual_Start"))
+    finish_text = clean_text(row.get("Actual_Finish"))
+    pct_text = clean_text(row.get("Physical_Pct_Complete"))
+    remain_text = clean_text(row.get("Remaining_Duration_Days"))
+
+    start = parse_date(start_text) if start_text else None
+    finish = parse_date(finish_text) if finish_text else None
+    pct = _parse_number(pct_text, "percent complete") if pct_text else None
+    remain_days = _parse_number(remain_text, "remaining duration") if remain_text else None
+
+    if start and start > data_date:
+        raise ValueError(f"actual start {start:%Y-%m-%d %H:%M} is after the data date")
+    if finish and finish > data_date:
+        raise ValueError(f"actual finish {finish:%Y-%m-%d %H:%M} is after the data date")
+    if pct is not None and not 0 <= pct <= 100:
+        raise ValueError(f"percent complete {pct:g} is outside 0-100")
+    if remain_days is not None and remain_days < 0:
+        raise ValueError(f"remaining duration {remain_days:g} is negative")
+
+    new_start = start or (parse_date(cur_start) if cur_start else None)
+    new_finish = finish or (parse_date(cur_finish) if cur_finish else None)
+    if new_finish and not new_start:
+        raise ValueError("actual finish given without an actual start")
+    if new_start and new_finish and new_finish < new_start:
+        raise ValueError("actual finish is before actual start")
+
+    # --- Status transitions ---
+    if status == "TK_Complete" and ((pct is not None and pct < 100) or (remain_days or 0) > 0):
+        raise ValueError("activity is already completed and cannot be reopened by a progress update")
+    if new_finish:
+        new_status = "TK_Complete"
+        if pct is not None and pct < 100:
+            raise ValueError(f"completed activity reported at {pct:g}% complete")
+        if (remain_days or 0) > 0:
+            raise ValueError("completed activity reported with remaining duration")
+    elif new_start:
+        new_status = "TK_Active"
+    else:
+        if pct or remain_days is not None:
+            raise ValueError("progress reported without an actual start")
+        return None  # not started and staying that way
+
+    target_hr = target_hr or 0.0
+    if new_status == "TK_Complete":
+        new_pct, new_remain_hr, restart, fraction = 100.0, 0.0, None, 1.0
+    else:
+        new_pct = pct if pct is not None else (phys_pct or 0.0)
+        new_remain_hr = remain_days * hours_per_day if remain_days is not None else remain_hr
+        if new_remain_hr is None:
+            new_remain_hr = target_hr
+        restart = data_date.strftime(DATE_FORMAT)
+        if target_hr > 0:
+            fraction = min(max((target_hr - new_remain_hr) / target_hr, 0.0), 1.0)
+        else:
+            fraction = new_pct / 100
+
+    return (
+        task_id, new_status,
+        new_start.strftime(DATE_FORMAT) if new_start else None,
+        new_finish.strftime(DATE_FORMAT) if new_finish else None,
+        new_pct, new_remain_hr, restart, fraction, auto_compute,
+    )
+
+
+def apply_progress(project, rows, data_date):
+    """
+    Applies progress rows (see the module docstring for the columns) to the
+    activities of a P6Project as of `data_date` (a datetime or date string).
+
+    All rows are validated first; if any row is invalid nothing is written and
+    a ValueError listing the problems (by CSV line) is raised. Otherwise TASK
+    and TASKRSRC are updated in one transaction.
+    Returns {'updated': activities changed, 'completed': ..., 'in_progress': ...}.
+    """
+    if not isinstance(data_date, datetime):
+        data_date = parse_date(data_date)
+    rows = [row for _, row in iter_records(rows)]
+    cursor = project.cursor
+
+    codes = [clean_text(row.get("Activity_ID")) for row in rows]
+    current = _load_current_state(cursor, project.proj_id, codes)
+
+    errors, staged, seen = [], [], set()
+    now = datetime.now().strftime(DATE_FORMAT)
+    for line, (code, row) in enumerate(zip(codes, rows), start=2):  # line 1 is the CSV header
+        if not code:
+            errors.append(f"line {line}: missing Activity_ID")
+            continue
+        if code in seen:
+            errors.append(f"line {line}: activity '{code}' appears more than once")
+            continue
+        seen.add(code)
+        state = current.get(code)
+        if state is None:
+            errors.append(f"line {line}: activity '{code}' not found in project '{project.project_short_name}'")
+            continue
+        try:
+            resolved = _resolve_row(row, state, data_date, project.hours_per_day)
+        except ValueError as e:
+            errors.append(f"line {line}: activity '{code}': {e}")
+            continue
+        if resolved:
+            staged.append(resolved + (now, project.user_name))
+
+    if errors:
+        listed = "\n  ".join(errors[:MAX_REPORTED_ERRORS])
+        more = f"\n  ... and {len(errors) - MAX_REPORTED_ERRORS} more" if len(errors) > MAX_REPORTED_ERRORS else ""
+        raise ValueError(f"{len(errors)} progress row(s) failed validation:\n  {listed}{more}")
+
+    with project.transaction():
+        cursor.execute("DROP TABLE IF EXISTS temp.progress_update")
+        cursor.execute(f"CREATE TEMP TABLE progress_update ({STAGED_COLUMNS[0]} INTEGER PRIMARY KEY, "
+                       f"{', '.join(STAGED_COLUMNS[1:])})")
+        cursor.executemany(f"INSERT INTO temp.progress_update VALUES ({', '.join('?' * len(STAGED_COLUMNS))})", staged)
+        cursor.execute(_update_sql("TASK", TASK_ASSIGNMENTS))
+        cursor.execute(_update_sql("TASKRSRC", TASKRSRC_ASSIGNMENTS))
+        cursor.execute(_update_sql("TASK", TASK_WORK_ASSIGNMENTS, TASK_WORK_SOURCE))
+        cursor.execute("DROP TABLE temp.progress_update")
+
+    completed = sum(1 for row in staged if row[1] == "TK_Complete")
+    return {"updated": len(staged), "completed": completed, "in_progress": len(staged) - completed}
+
+# --- END OF FILE src/pyp6/progress.py ---
@@ -0,0 +1,448 @@
+# --- START OF FILE src/pyp6/project.py ---
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from pyp6.access_p6 import (
+    IdAllocator,
+    build_task_code_map,
+    build_wbs_cache,
+    generate_guid,
+    get_project_defaults,
+    parse_relationship,
+)
+from pyp6.utils import DEFAULTS
+
+# --- SQL Statements ---
+# Kept as module constants so every call sends the exact same text; sqlite3
+# then reuses its compiled statement from the connection's statement cache.
+
+SQL_INSERT_OBS = """
+    INSERT INTO OBS (obs_id, parent_obs_id, seq_num, obs_name, guid,
+                     create_date, create_user, update_date, update_user)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_ROLE = """
+    INSERT INTO ROLES (
+        role_id, parent_role_id, role_name, role_short_name,
+        create_date, create_user, update_date, update_user
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_WBS = """
+    INSERT INTO PROJWBS (
+        wbs_id, proj_id, obs_id, seq_num, est_wt, proj_node_flag,
+        sum_data_flag, status_code, wbs_short_name, wbs_name, parent_wbs_id,
+        ev_compute_type, ev_etc_compute_type,
+        guid, tmpl_guid, create_date, create_user, update_date, update_user
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_TASK = """
+    INSERT INTO TASK (task_id, proj_id, wbs_id, clndr_id, task_code, task_name, status_code, task_type, duration_type,
+                      complete_pct_type, target_drtn_hr_cnt, remain_drtn_hr_cnt, auto_compute_act_flag, guid,
+                      create_date, create_user, update_date, update_user)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_TASKPRED = """
+    INSERT INTO TASKPRED (task_pred_id, task_id, pred_task_id, proj_id, pred_proj_id,
+                          pred_type, lag_hr_cnt, create_date, create_user, update_date, update_user)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+LINK_TYPES = ("PR_FS", "PR_SS", "PR_FF", "PR_SF")
+
+# Reason given for skipped links that are already in the project.
+LINK_EXISTS = "relationship already exists"
+
+
+def iter_records(frame):
+    """
+    Yields (index, row) pairs from either a pandas DataFrame or any iterable
+    of dict-like rows, so callers do not need pandas to use the API.
+    """
+    if hasattr(frame, "to_dict"):
+        frame = frame.to_dict("records")
+    return enumerate(frame)
+
+
+def clean_text(value):
+    """Returns a stripped string, treating None and NaN as empty."""
+    if value is None or value != value:  # NaN is the only value not equal to itself
+        return ""
+    return str(value).strip()
+
+
+class P6Database:
+    """
+    A long-lived handle on a P6 SQLite database for the global tables (OBS and
+    roles), which do not belong to any project.
+
+    The connection, name->ID caches and the primary key allocator are loaded
+    once and reused by every call. Every add_* method runs in its own
+    transaction unless it is called inside a `with db.transaction():` block,
+    in which case the whole block is committed or rolled back together.
+
+    The caches assume this object is the only writer while it is open. If
+    other processes change the database, call refresh() before the next batch.
+    """
+
+    def __init__(self, db_path, user_name=DEFAULTS["USER_NAME"], verbose=False):
+        self.db_path = db_path
+        self.user_name = user_name
+        self.verbose = verbose
+
+        self.conn = sqlite3.connect(db_path)
+        self._log("Successfully connected to the P6 SQLite database.")
+        self.cursor = self.conn.cursor()
+        self._in_transaction = False
+        try:
+            self._load()
+        except Exception:
+            self.conn.close()
+            raise
+
+    @classmethod
+    def from_config(cls, cfg, **kwargs):
+        """Opens the database described by a namespace returned from load_config()."""
+        return cls(cfg.P6_PRO_DB_PATH, user_name=cfg.USER_NAME, **kwargs)
+
+    def _load(self):
+        """Loads everything the handle needs after connecting; subclasses extend it."""
+        self.refresh()
+
+    # --- Lifecycle ---
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def refresh(self):
+        """Reloads all caches and the ID allocator from the database."""
+        self.ids = IdAllocator(self.cursor)
+        self.obs_cache = {}
+        for obs_name, obs_id in self.cursor.execute("SELECT obs_name, obs_id FROM OBS ORDER BY obs_id"):
+            self.obs_cache.setdefault(obs_name, obs_id)
+        self.role_cache = {}
+        for role_name, role_id in self.cursor.execute("SELECT role_name, role_id FROM ROLES ORDER BY role_id"):
+            self.role_cache.setdefault(role_name, role_id)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several add_* calls into one all-or-nothing transaction.
+        On failure the caches are reloaded so they do not point at rolled-back rows.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        try:
+            yield self
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            self.refresh()
+            raise
+        finally:
+            self._in_transaction = False
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    # --- OBS ---
+
+    def _get_or_create_obs_id(self, index, obs_name, parent_obs_name):
+        if not obs_name:
+            return None
+        if obs_name in self.obs_cache:
+            return self.obs_cache[obs_name]
+
+        self._log(f"OBS element '{obs_name}' not found. Attempting to create.")
+        # Missing parents are created on the fly; they get a placeholder index of -1.
+        parent_obs_id = self._get_or_create_obs_id(-1, parent_obs_name, None)
+
+        new_obs_id = self.ids.next("OBS", "obs_id")
+        current_time = datetime.now()
+        seq_num = (index + 1) * 10
+        self.cursor.execute(SQL_INSERT_OBS, (
+            new_obs_id, parent_obs_id, seq_num, obs_name, generate_guid(),
+            current_time, self.user_name, current_time, self.user_name,
+        ))
+        self.obs_cache[obs_name] = new_obs_id
+        self._log(f"  -> Successfully created OBS: '{obs_name}' with ID: {new_obs_id} and Seq Num: {seq_num}")
+        return new_obs_id
+
+    def add_obs(self, frame):
+        """
+        Adds OBS elements from rows with 'OBS_Name' and 'Parent_OBS_Name'.
+        Existing names are reused. Returns the {OBS name: obs_id} mapping for the rows.
+        """
+        result = {}
+        with self.transaction():
+            for index, row in iter_records(frame):
+                obs_name = clean_text(row["OBS_Name"])
+                obs_id = self._get_or_create_obs_id(index, obs_name, clean_text(row["Parent_OBS_Name"]))
+                if obs_id is not None:
+                    result[obs_name] = obs_id
+        return result
+
+    # --- Roles ---
+
+    def _get_or_create_role_id(self, role_name, short_name, parent_role_name):
+        if not role_name:
+            return None
+        if role_name in self.role_cache:
+            return self.role_cache[role_name]
+
+        self._log(f"Role '{role_name}' not found. Attempting to create.")
+        parent_role_id = self._get_or_create_role_id(parent_role_name, "", "")
+
+        new_role_id = self.ids.next("ROLES", "role_id")
+        current_time = datetime.now()
+        self.cursor.execute(SQL_INSERT_ROLE, (
+            new_role_id, parent_role_id, role_name, short_name,
+            current_time, self.user_name, current_time, self.user_name,
+        ))
+        self.role_cache[role_name] = new_role_id
+        self._log(f"  -> Successfully created Role: '{role_name}' with ID: {new_role_id}")
+        return new_role_id
+
+    def add_roles(self, frame):
+        """
+        Adds roles from rows with 'Role_Name', 'Role_Short_Name' and 'Parent_Role_Name'.
+        Existing names are reused. Returns the {role name: role_id} mapping for the rows.
+        """
+        result = {}
+        with self.transaction():
+            for _, row in iter_records(frame):
+                role_name = clean_text(row["Role_Name"])
+                role_id = self._get_or_create_role_id(
+                    role_name, clean_text(row["Role_Short_Name"]), clean_text(row["Parent_Role_Name"])
+                )
+                if role_id is not None:
+                    result[role_name] = role_id
+        return result
+
+
+class P6Project(P6Database):
+    """
+    A long-lived handle on one P6 project inside a SQLite database.
+
+    On top of P6Database, the project defaults and the project's WBS and
+    activity caches are loaded once and reused by every call, so a resident
+    service can push many small batches without paying the setup cost each
+    time. Transactions and refresh() work as in P6Database.
+    """
+
+    def __init__(self, db_path, project_short_name=DEFAULTS["TARGET_PROJECT_ID"],
+                 hours_per_day=DEFAULTS["HOURS_PER_DAY"], user_name=DEFAULTS["USER_NAME"],
+                 verbose=False):
+        self.project_short_name = project_short_name
+        self.hours_per_day = float(hours_per_day)
+        super().__init__(db_path, user_name=user_name, verbose=verbose)
+
+    @classmethod
+    def from_config(cls, cfg, **kwargs):
+        """Opens the project described by a namespace returned from load_config()."""
+        return cls(cfg.P6_PRO_DB_PATH, cfg.TARGET_PROJECT_ID,
+                   hours_per_day=cfg.HOURS_PER_DAY, user_name=cfg.USER_NAME, **kwargs)
+
+    def _load(self):
+        (self.proj_id, self.root_wbs_id,
+         self.clndr_id, self.project_obs_id) = get_project_defaults(self.cursor, self.project_short_name, self.verbose)
+        super()._load()
+
+    def refresh(self):
+        """Reloads all caches, including the project's WBS and activities, and the ID allocator."""
+        super().refresh()
+        self.wbs_cache = build_wbs_cache(self.cursor, self.proj_id, self.verbose)
+        self.task_cache = build_task_code_map(self.cursor, self.proj_id, self.verbose)
+        self.link_keys = None  # (task_id, pred_task_id, pred_type) of existing links, loaded by add_links()
+
+    # --- WBS ---
+
+    def add_wbs(self, frame):
+        """
+        Adds WBS elements from rows with 'WBS Short Name', 'WBS Name' and
+        'Parent WBS Name'. A blank parent places the element under the project
+        root; otherwise the parent must already exist or appear earlier in the
+        same frame. Returns the {WBS name: wbs_id} mapping for the rows.
+        """
+        result = {}
+        with self.transaction():
+            for index, row in iter_records(frame):
+                wbs_short_name = clean_text(row["WBS Short Name"])
+                wbs_name = clean_text(row["WBS Name"])
+                parent_wbs_name = clean_text(row["Parent WBS Name"])
+
+                if wbs_name in self.wbs_cache:
+                    self._log(f"Found existing WBS: '{wbs_name}' (ID: {self.wbs_cache[wbs_name]}). Skipping creation.")
+                    result[wbs_name] = self.wbs_cache[wbs_name]
+                    continue
+
+                parent_wbs_id = self.root_wbs_id
+                if parent_wbs_name:
+                    parent_wbs_id = self.wbs_cache.get(parent_wbs_name)
+                    if not parent_wbs_id:
+                        raise ValueError(f"Could not find parent WBS with name '{parent_wbs_name}'. Please ensure parent rows appear before child rows in your CSV file.")
+
+                result[wbs_name] = self.create_wbs(wbs_short_name, wbs_name, parent_wbs_id, index)
+        return result
+
+    def create_wbs(self, wbs_short_name, wbs_name, parent_wbs_id=None, index=0):
+        """
+        Inserts one WBS element under `parent_wbs_id` (the project root if None)
+        and returns its wbs_id. Unlike add_wbs(), the name is not looked up, so
+        elements with the same name can be created under different parents.
+        The name cache keeps pointing at the first element with a given name.
+        """
+        new_wbs_id = self.ids.next("PROJWBS", "wbs_id")
+        current_time = datetime.now()
+        with self.transaction():
+            self.cursor.execute(SQL_INSERT_WBS, (
+                new_wbs_id, self.proj_id, self.project_obs_id, (index + 1) * 10, 1.0,
+                'N', 'N', 'WS_Open', wbs_short_name, wbs_name, parent_wbs_id or self.root_wbs_id,
+                'EC_Cmp_pct', 'EE_Rem_hr',
+                generate_guid(), generate_guid(),  # guid, tmpl_guid
+                current_time, self.user_name, current_time, self.user_name,
+            ))
+        self.wbs_cache.setdefault(wbs_name, new_wbs_id)
+        self._log(f"  -> Successfully created WBS: '{wbs_name}' with ID: {new_wbs_id}")
+        return new_wbs_id
+
+    # --- Activities ---
+
+    def add_activities(self, frame):
+        """
+        Adds activities from rows with 'Activity_ID', 'Activity_Name',
+        'Duration_Days' and 'WBS_Name'. A row may carry a 'wbs_id' instead of
+        'WBS_Name' to place the activity under a specific WBS element, e.g. one
+        whose name is not unique. Activity codes that already exist in
+        the project are skipped. Relationships are not created here; pass the
+        same rows to add_relationships() afterwards.
+        Returns the {Activity ID: task_id} mapping for newly created activities.
+        """
+        created = {}
+        task_rows = []
+        current_time = datetime.now()
+        for _, row in iter_records(frame):
+            task_code = clean_text(row["Activity_ID"])
+            wbs_name = clean_text(row.get("WBS_Name"))
+
+            wbs_id = row.get("wbs_id") or self.root_wbs_id
+            if wbs_name and not row.get("wbs_id"):
+                wbs_id = self.wbs_cache.get(wbs_name)
+                if not wbs_id:
+                    raise ValueError(
+                        f"WBS Name '{wbs_name}' for Activity '{task_code}' not found in the project's WBS structure."
+                    )
+
+            if task_code in self.task_cache or task_code in created:
+                self._log(f"  -> INFO: Activity code '{task_code}' already exists in DB or is a duplicate in the CSV. Skipping creation.")
+                continue
+
+            duration_hours = float(clean_text(row["Duration_Days"]) or 0) * self.hours_per_day
+            task_id = self.ids.next("TASK", "task_id")
+            task_rows.append((
+                task_id, self.proj_id, wbs_id, self.clndr_id, task_code, clean_text(row["Activity_Name"]),
+                "TK_NotStart", "TT_Task", "DT_FixedDur", "CP_Drtn",
+                duration_hours, duration_hours, "Y", generate_guid(),
+                current_time, self.user_name, current_time, self.user_name,
+            ))
+            created[task_code] = task_id
+            self._log(f"  -> Queued Activity '{task_code}' (under WBS: '{wbs_name or 'Project Root'}') with Task ID: {task_id}")
+
+        with self.transaction():
+            self.cursor.executemany(SQL_INSERT_TASK, task_rows)
+            self.task_cache.update(created)
+        return created
+
+    def add_relationships(self, frame):
+        """
+        Adds relationships from rows with 'Activity_ID' and 'Predecessors',
+        where Predecessors is a comma-separated list such as 'A1000[SS+5d], A1010'.
+        Links to unknown activities or with an unparsable format are skipped.
+        Returns (number of relationships created, skipped links), where each
+        skipped link is a (successor, predecessor, reason) tuple.
+        """
+        links, skipped = [], []
+        for _, row in iter_records(frame):
+            successor_code = clean_text(row["Activity_ID"])
+            predecessors_str = clean_text(row["Predecessors"])
+            if not predecessors_str:
+                continue
+
+            for pred_str in (p.strip() for p in predecessors_str.split(",")):
+                try:
+                    pred_code, pred_type, lag_hours = parse_relationship(pred_str, self.hours_per_day)
+                except ValueError as e:
+                    self._skip_link(skipped, successor_code, pred_str, f"could not parse relationship: {e}")
+                    continue
+                links.append((successor_code, pred_code, pred_type, lag_hours))
+        created, link_skipped = self.add_links(links)
+        return created, skipped + link_skipped
+
+    def add_links(self, links):
+        """
+        Adds relationships from (successor code, predecessor code, pred_type, lag hours)
+        tuples, where pred_type is a P6 link type ('PR_FS', 'PR_SS', 'PR_FF' or 'PR_SF').
+        Links to unknown activities and links that already exist (in the
+        project or earlier in `links`) are skipped; an unknown link type raises
+        ValueError. Returns (number of relationships created, skipped links),
+        where each skipped link is a (successor, predecessor, reason) tuple.
+        """
+        if self.link_keys is None:
+            self.cursor.execute("SELECT task_id, pred_task_id, pred_type FROM TASKPRED WHERE proj_id = ?",
+                                (self.proj_id,))
+            self.link_keys = set(self.cursor.fetchall())
+
+        pred_rows, skipped, new_keys = [], [], set()
+        current_time = datetime.now()
+        for successor_code, pred_code, pred_type, lag_hours in links:
+            if pred_type not in LINK_TYPES:
+                raise ValueError(f"Invalid relationship type '{pred_type}' for link {pred_code} -> {successor_code}.")
+
+            successor_task_id = self.task_cache.get(successor_code)
+            if not successor_task_id:
+                self._skip_link(skipped, successor_code, pred_code, "activity not found in the project")
+                continue
+            predecessor_task_id = self.task_cache.get(pred_code)
+            if not predecessor_task_id:
+                self._skip_link(skipped, successor_code, pred_code, "predecessor activity not found in the project")
+                continue
+            key = (successor_task_id, predecessor_task_id, pred_type)
+            if key in self.link_keys or key in new_keys:
+                self._skip_link(skipped, successor_code, pred_code, LINK_EXISTS)
+                continue
+            new_keys.add(key)
+
+            lag_hours = float(lag_hours or 0)
+            pred_rows.append((
+                self.ids.next("TASKPRED", "task_pred_id"), successor_task_id, predecessor_task_id,
+                self.proj_id, self.proj_id, pred_type, lag_hours,
+                current_time, self.user_name, current_time, self.user_name,
+            ))
+            self._log(f"  -> Queued link: {pred_code} -> {successor_code} (Type: {pred_type.replace('PR_','')}, Lag: {lag_hours}h)")
+
+        with self.transaction():
+            self.cursor.executemany(SQL_INSERT_TASKPRED, pred_rows)
+        self.link_keys |= new_keys
+        return len(pred_rows), skipped
+
+    def _skip_link(self, skipped, successor, predecessor, reason):
+        skipped.append((successor, predecessor, reason))
+        self._log(f"  -> ERROR: Skipping link {predecessor} -> {successor}: {reason}.")
+
+# --- END OF FILE src/pyp6/project.py ---
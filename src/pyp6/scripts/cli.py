@@ -0,0 +1,225 @@
+# --- START OF FILE src/pyp6/scripts/cli.py ---
+
+import argparse
+import sqlite3
+import sys
+
+from pyp6.utils import load_config, read_csv_rows
+
+# --- Load Plan ---
+# Files in dependency order: (config attribute of the CSV path, required columns,
+# stages as (stage name, P6Project method)). The activities CSV feeds two stages
+# and is read only once.
+LOAD_STAGES = [
+    ("OBS_FILE_PATH", ["OBS_Name", "Parent_OBS_Name"], [("OBS", "add_obs")]),
+    ("WBS_FILE_PATH", ["WBS Short Name", "WBS Name", "Parent WBS Name"], [("WBS", "add_wbs")]),
+    ("ROLES_FILE_PATH", ["Role_Name", "Role_Short_Name", "Parent_Role_Name"], [("Roles", "add_roles")]),
+    ("ACT_FILE_PATH", ["Activity_ID", "Activity_Name", "Duration_Days", "WBS_Name", "Predecessors"],
+     [("Activities", "add_activities"), ("Relationships", "add_relationships")]),
+]
+
+
+def build_load_plan(cfg):
+    """
+    Reads and validates every CSV found in the data folder before the database
+    is touched. Returns a list of (stage name, file path, rows, P6Project method).
+    Missing files are skipped; a malformed file raises ValueError.
+    """
+    plan = []
+    for path_attr, required_cols, stages in LOAD_STAGES:
+        file_path = getattr(cfg, path_attr)
+        if not file_path.is_file():
+            names = " and ".join(stage for stage, _ in stages)
+            print(f"  -> INFO: '{file_path}' not found. Skipping the {names} stage{'s' if len(stages) > 1 else ''}.")
+            continue
+        try:
+            rows = read_csv_rows(file_path, required_cols)
+        except ValueError as e:
+            raise ValueError(f"'{file_path}': {e}") from e
+        plan.extend((stage, file_path, rows, method) for stage, method in stages)
+    return plan
+
+
+def load(cfg, dry_run=False):
+    """Runs every stage of the load plan against the target project in one transaction."""
+    print(f"Building load plan from '{cfg.DATA_PATH}'...")
+    try:
+        plan = build_load_plan(cfg)
+    except ValueError as e:
+        print(f"ERROR: CSV format is incorrect. {e}")
+        sys.exit(1)
+
+    if not plan:
+        print("ERROR: No CSV files were found in the data folder. Nothing to load.")
+        sys.exit(1)
+
+    print("\nLoad plan:")
+    for number, (stage, file_path, rows, _) in enumerate(plan, start=1):
+        print(f"  {number}. {stage:<14} {len(rows):>6} rows from '{file_path.name}'")
+    if dry_run:
+        print("\nDry run: no changes were made to the database.")
+        return
+
+    from pyp6.project import P6Project
+
+    try:
+        project = P6Project.from_config(cfg, verbose=True)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"ERROR: Could not open project '{cfg.TARGET_PROJECT_ID}': {e}")
+        sys.exit(1)
+
+    try:
+        # One transaction for all stages: a failure in any stage undoes every earlier one.
+        with project.transaction():
+            for stage, _, rows, method in plan:
+                print(f"\n--- Loading {stage} ---")
+                getattr(project, method)(rows)
+
+        print("\nSUCCESS: All stages have been committed in a single transaction.")
+        print("IMPORTANT: Open P6 and press F9 (Schedule) to see the changes.")
+
+    except (ValueError, sqlite3.Error) as e:
+        print(f"\nERROR: An error occurred: {e}. Rolling back all changes.")
+        sys.exit(1)
+    finally:
+        project.close()
+        print("Database connection closed.")
+
+
+def export_mspdi(cfg, output_path):
+    """Writes the target project to an MS Project XML file."""
+    from pyp6.access_db import connect_to_db
+    from pyp6.mspdi import export_mspdi as write_mspdi
+
+    conn = connect_to_db(cfg.P6_PRO_DB_PATH)
+    try:
+        count = write_mspdi(conn.cursor(), cfg.TARGET_PROJECT_ID, output_path, cfg.HOURS_PER_DAY)
+        print(f"SUCCESS: Exported {count} activities from '{cfg.TARGET_PROJECT_ID}' to '{output_path}'.")
+    except (ValueError, sqlite3.Error, OSError) as e:
+        print(f"ERROR: Export failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+        print("Database connection closed.")
+
+
+def import_mspdi(cfg, input_path):
+    """Loads an MS Project XML file into the target project in one transaction."""
+    from xml.etree.ElementTree import ParseError
+
+    from pyp6.mspdi import import_mspdi as read_mspdi
+    from pyp6.project import LINK_EXISTS, P6Project
+
+    try:
+        project = P6Project.from_config(cfg)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"ERROR: Could not open project '{cfg.TARGET_PROJECT_ID}': {e}")
+        sys.exit(1)
+
+    try:
+        wbs_count, activity_count, link_count, skipped_links = read_mspdi(project, input_path)
+        print(f"SUCCESS: Imported {wbs_count} WBS elements, {activity_count} activities and "
+              f"{link_count} new relationships from '{input_path}'.")
+        existing = sum(1 for _, _, reason in skipped_links if reason == LINK_EXISTS)
+        problems = [link for link in skipped_links if link[2] != LINK_EXISTS]
+        if existing:
+            print(f"  -> INFO: {existing} relationships were already in the project.")
+        if problems:
+            print(f"WARNING: {len(problems)} relationship(s) were skipped:")
+            for successor, predecessor, reason in problems[:20]:
+                print(f"  -> {predecessor} -> {successor}: {reason}")
+            if len(problems) > 20:
+                print(f"  ... and {len(problems) - 20} more")
+        print("IMPORTANT: Open P6 and press F9 (Schedule) to see the changes.")
+    except (ValueError, sqlite3.Error, OSError, ParseError) as e:
+        print(f"\nERROR: An error occurred: {e}. Rolling back all changes.")
+        sys.exit(1)
+    finally:
+        project.close()
+        print("Database connection closed.")
+
+
+def earned_value(cfg, data_date=None, max_depth=1, csv_path=None):
+    """Prints the earned value roll-up of the target project and optionally writes every WBS row to CSV."""
+    import csv
+
+    from pyp6.access_db import connect_to_db
+    from pyp6.earned_value import compute_earned_value
+    from pyp6.progress import parse_date
+
+    if data_date:
+        try:
+            data_date = parse_date(data_date)
+        except ValueError as e:
+            print(f"ERROR: --data-date: {e}")
+            sys.exit(1)
+
+    conn = connect_to_db(cfg.P6_PRO_DB_PATH)
+    try:
+        results = compute_earned_value(conn.cursor(), cfg.TARGET_PROJECT_ID, data_date)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"ERROR: Earned value calculation failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    def fmt(value, pattern):
+        return format(value, pattern) if value is not None else "-"
+
+    print(f"\n{'WBS':<40} {'BAC':>14} {'PV':>14} {'EV':>14} {'AC':>14} {'SPI':>6} {'CPI':>6} {'% cmp':>6}")
+    for row in results:
+        if row["depth"] > max_depth:
+            continue
+        label = ("  " * row["depth"] + (row["wbs_name"] or row["wbs_short_name"] or ""))[:40]
+        print(f"{label:<40} {row['bac']:>14,.0f} {row['pv']:>14,.0f} {row['ev']:>14,.0f} {row['ac']:>14,.0f} "
+              f"{fmt(row['spi'], '6.2f')} {fmt(row['cpi'], '6.2f')} {fmt(row['weighted_pct'], '6.1f')}")
+
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\nSUCCESS: Earned value for {len(results)} WBS elements written to '{csv_path}'.")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="pyp6", description="PyP6: Python for Primavera P6.")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    load_parser = subparsers.add_parser(
+        "load",
+        help="Load OBS, WBS, Roles, Activities and Relationships from the data folder in one transaction.",
+    )
+    load_parser.add_argument("--dry-run", action="store_true",
+                             help="Read and validate the CSV files and print the plan without writing to the database.")
+
+    export_parser = subparsers.add_parser("export-mspdi", help="Export the target project to an MS Project XML (MSPDI) file.")
+    export_parser.add_argument("output", help="Path of the .xml file to write.")
+
+    import_parser = subparsers.add_parser("import-mspdi", help="Import an MS Project XML (MSPDI) file into the target project.")
+    import_parser.add_argument("input", help="Path of the .xml file to read.")
+
+    ev_parser = subparsers.add_parser("earned-value", help="Roll up PV/EV/AC, SPI/CPI and percent complete through the WBS.")
+    ev_parser.add_argument("--data-date", default=None,
+                           help="Date (YYYY-MM-DD or 'YYYY-MM-DD HH:MM') for planned value instead of the project's data date.")
+    ev_parser.add_argument("--depth", type=int, default=1, help="Deepest WBS level to print (default: 1).")
+    ev_parser.add_argument("--csv", default=None, help="Also write every WBS element's results to this CSV file.")
+
+    args = parser.parse_args()
+    cfg = load_config()
+
+    if args.command == "load":
+        load(cfg, dry_run=args.dry_run)
+    elif args.command == "export-mspdi":
+        export_mspdi(cfg, args.output)
+    elif args.command == "import-mspdi":
+        import_mspdi(cfg, args.input)
+    elif args.command == "earned-value":
+        earned_value(cfg, args.data_date, args.depth, args.csv)
+
+
+if __name__ == "__main__":
+    main()
+
+# --- END OF FILE src/pyp6/scripts/cli.py ---
@@ -0,0 +1,71 @@
+# --- START OF FILE progress.py ---
+
+import argparse
+import sqlite3
+import sys
+
+from pyp6.utils import load_config, read_csv_rows
+
+
+# --- Main Execution ---
+
+
+def main():
+    """Main function to read a progress CSV and update actuals of existing activities as of a data date."""
+    parser = argparse.ArgumentParser(
+        prog="pyp6-progress",
+        description="Update actual dates, percent complete and remaining durations of existing activities.",
+    )
+    parser.add_argument("--data-date", required=True,
+                        help="Status date of the update (YYYY-MM-DD or 'YYYY-MM-DD HH:MM'). No actual may be later.")
+    parser.add_argument("--file", default=None,
+                        help="Progress CSV to read (default: progress.csv in the data folder).")
+    args = parser.parse_args()
+    cfg = load_config()
+
+    from pyp6.progress import apply_progress, parse_date
+    from pyp6.project import P6Project
+
+    try:
+        data_date = parse_date(args.data_date)
+    except ValueError as e:
+        print(f"ERROR: --data-date: {e}")
+        sys.exit(1)
+
+    file_path = args.file or cfg.PROGRESS_FILE_PATH
+    try:
+        rows = read_csv_rows(file_path, ["Activity_ID"])
+        print(f"Read {len(rows)} records from '{file_path}'.")
+    except FileNotFoundError:
+        print(f"ERROR: The file '{file_path}' was not found.")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: CSV format is incorrect. {e}")
+        sys.exit(1)
+
+    try:
+        project = P6Project.from_config(cfg)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"ERROR: Could not open project '{cfg.TARGET_PROJECT_ID}': {e}")
+        sys.exit(1)
+
+    try:
+        print(f"\n--- Applying progress as of {data_date:%Y-%m-%d %H:%M} ---")
+        counts = apply_progress(project, rows, data_date)
+
+        print(f"\nSUCCESS: Updated {counts['updated']} activities "
+              f"({counts['completed']} completed, {counts['in_progress']} in progress) in a single transaction.")
+        print("IMPORTANT: Open P6, set the data date and press F9 (Schedule) to see the changes.")
+
+    except (ValueError, sqlite3.Error) as e:
+        print(f"\nERROR: {e}\nNo changes were made.")
+        sys.exit(1)
+    finally:
+        project.close()
+        print("Database connection closed.")
+
+
+if __name__ == "__main__":
+    main()
+
+# --- END OF FILE progress.py ---
@@ -1,5 +1,6 @@
 # --- START OF FILE src/pyp6/utils.py ---
 
+import csv
 import json
 from pathlib import Path
 import sys
@@ -16,6 +17,10 @@ DEFAULTS = {
     "USER_NAME": "PyP6_Script"
 }
 
+# CSV files at or above this size are read with pandas (when installed).
+# Anything smaller is read with the csv module so the CLI never pays for the pandas import.
+PANDAS_MIN_BYTES = 1_000_000
+
 def load_config():
     """
     Loads configuration and returns it as a namespace object (like a module).
@@ -53,7 +58,38 @@ def load_config():
     cfg.OBS_FILE_PATH = cfg.DATA_PATH / "obs.csv"
     cfg.WBS_FILE_PATH = cfg.DATA_PATH / "wbs.csv"
     cfg.ROLES_FILE_PATH = cfg.DATA_PATH / "roles.csv"
+    cfg.PROGRESS_FILE_PATH = cfg.DATA_PATH / "progress.csv"
     
     return cfg
 
+def read_csv_rows(file_path, required_cols):
+    """
+    Reads a CSV file into a list of dicts with every value as a string
+    (blank cells become ''), and checks that the required columns are present.
+    Raises FileNotFoundError if the file is missing and ValueError if columns are missing.
+    """
+    file_path = Path(file_path)
+    if file_path.is_file() and file_path.stat().st_size >= PANDAS_MIN_BYTES:
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+        if pd is not None:
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+            columns, rows = list(df.columns), df.to_dict("records")
+            _check_columns(columns, required_cols)
+            return rows
+
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames or []
+        _check_columns(columns, required_cols)
+        # DictReader fills short rows with None; normalise to '' like fillna('') did.
+        return [{k: (v if v is not None else "") for k, v in row.items()} for row in reader]
+
+
+def _check_columns(columns, required_cols):
+    if not all(col in columns for col in required_cols):
+        raise ValueError(f"CSV must contain the columns: {', '.join(required_cols)}.")
+
 # --- END OF FILE src/pyp6/utils.py ---
\ No newline at end of file